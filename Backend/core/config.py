@@ -10,8 +10,28 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int 
     algorithm: str
     frontend_url: str
+    bcrypt_rounds: int = 12
+
+    # MongoDB connection pool
+    mongo_max_pool_size: int = 50
+    mongo_min_pool_size: int = 10
+    mongo_max_idle_time_ms: int = 60000
 
     ## To get all the values 
     model_config = SettingsConfigDict(env_file=".env")
 
-settings = Settings()
\ No newline at end of file
+    @property
+    def cors_origins(self) -> list[str]:
+        """Comma-separated FRONTEND_URL as a list of allowed origins."""
+        return [origin.strip() for origin in self.frontend_url.split(",") if origin.strip()]
+
+settings = Settings()
+
+# Resolved once so the token hot paths don't go through the settings object
+SECRET_KEY = settings.secret_key
+ALGORITHM = settings.algorithm
+ACCESS_TOKEN_TTL_SECONDS = settings.access_token_expire_minutes * 60
+JWT_DECODE_KWARGS = {
+    "algorithms": [ALGORITHM],
+    "options": {"require_exp": True, "require_sub": True},
+}
\ No newline at end of file
@@ -1,11 +1,46 @@
+import hashlib
+import threading
+import time
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from db.mongodb import get_database
-from core.config import settings
+from core.config import SECRET_KEY, JWT_DECODE_KWARGS
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# Decoded JWT payloads keyed by sha256(token). The short TTL bounds how long a
+# revoked token can keep working; "exp" is still enforced by jwt.decode.
+_token_cache = TTLCache(maxsize=10000, ttl=30)
+_token_cache_lock = threading.Lock()
+
+# User documents (password stripped, _id stringified) keyed by email. Kept short
+# so profile or permission changes propagate quickly.
+_user_cache = TTLCache(maxsize=5000, ttl=60)
+_user_cache_lock = threading.Lock()
+
+
+def _decode_cached(token: str) -> dict:
+    """Decode a JWT, reusing the payload of recently seen tokens."""
+    key = hashlib.sha256(token.encode()).hexdigest()
+    with _token_cache_lock:
+        payload = _token_cache.get(key)
+    if payload is not None and payload.get("exp", 0) > time.time():
+        return payload
+
+    payload = jwt.decode(token, SECRET_KEY, **JWT_DECODE_KWARGS)
+    with _token_cache_lock:
+        _token_cache[key] = payload
+    return payload
+
+
+def invalidate_user(email: str) -> None:
+    """Evict a cached user document, e.g. after the user record changes."""
+    with _user_cache_lock:
+        _user_cache.pop(email, None)
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db = Depends(get_database)
@@ -18,20 +53,27 @@ async def get_current_user(
     
     try:
         # Decode the JWT token
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        payload = _decode_cached(token)
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
     
-    # Find user in database
-    user = await db["users"].find_one({"email": email})
+    with _user_cache_lock:
+        cached = _user_cache.get(email)
+    if cached is not None:
+        return dict(cached)
+
+    # Find user in database (the password hash is excluded server-side)
+    user = await db["users"].find_one({"email": email}, projection={"password": 0})
     if user is None:
         raise credentials_exception
     
-    # Convert ObjectId to string and remove password
+    # Convert ObjectId to string
     user["_id"] = str(user["_id"])
-    user.pop("password", None)
+
+    with _user_cache_lock:
+        _user_cache[email] = user
     
-    return user
\ No newline at end of file
+    return dict(user)
\ No newline at end of file
@@ -1,13 +1,18 @@
 import bcrypt
 import hashlib
 import base64
-from datetime import datetime, timedelta
+import time
 from jose import jwt
-from core.config import settings
+from core.config import settings, SECRET_KEY, ALGORITHM, ACCESS_TOKEN_TTL_SECONDS
 
 
 def _prehash_password(password: str) -> bytes:
-    """Pre-hash password with SHA-256 to handle any length."""
+    """Pre-hash password with SHA-256 to handle any length.
+
+    The digest is base64-encoded because raw SHA-256 output may contain NUL
+    bytes, which bcrypt treats as a terminator. Stored hashes depend on this
+    exact encoding, so it must not change without a migration.
+    """
     sha256_hash = hashlib.sha256(password.encode('utf-8')).digest()
     return base64.b64encode(sha256_hash)
 
@@ -15,7 +20,7 @@ def _prehash_password(password: str) -> bytes:
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt."""
     prehashed = _prehash_password(password)
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.bcrypt_rounds)
     hashed = bcrypt.hashpw(prehashed, salt)
     return hashed.decode('utf-8')
 
@@ -28,6 +33,5 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def create_access_token(data: dict):
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
\ No newline at end of file
+    to_encode["exp"] = int(time.time()) + ACCESS_TOKEN_TTL_SECONDS
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
\ No newline at end of file
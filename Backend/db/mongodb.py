@@ -6,5 +6,15 @@ class Database:
 
 db_instance = Database()
 
+def connect_to_mongo():
+    db_instance.client = AsyncIOMotorClient(
+        settings.mongodb_url,
+        maxPoolSize=settings.mongo_max_pool_size,
+        minPoolSize=settings.mongo_min_pool_size,
+        maxIdleTimeMS=settings.mongo_max_idle_time_ms,
+        serverSelectionTimeoutMS=5000,
+    )
+    return db_instance.client
+
 async def get_database():
     return db_instance.client[settings.database_name]
@@ -1,42 +1,78 @@
+import logging
 from fastapi import FastAPI , Request
 from fastapi.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
 from core.config import settings
-from db.mongodb import db_instance
+from db.mongodb import db_instance, connect_to_mongo
 from routes import auth 
 from contextlib import asynccontextmanager
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
 
 ## CORS Setup 
+CORS_KWARGS = {
+    "allow_origins": settings.cors_origins,
+    "allow_credentials": True,
+    "allow_methods": ["GET", "POST"],
+    "allow_headers": ["Authorization", "Content-Type"],
+}
+
+async def ensure_unique_email_index(users) -> None:
+    """
+    Create the unique index on users.email.
+
+    Databases populated before the index existed may hold duplicate emails,
+    which makes index creation fail. The app still starts in that case, but
+    the duplicates are logged so they can be merged (see README,
+    Troubleshooting) and the index created on the next start.
+    """
+    try:
+        await users.create_index("email", unique=True)
+    except OperationFailure as e:
+        duplicates = await users.aggregate([
+            {"$group": {"_id": "$email", "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}},
+            {"$limit": 50},
+        ]).to_list(length=50)
+        logger.error(
+            "Could not create unique index on users.email (%s). Duplicate emails: %s. "
+            "Registration cannot reject duplicates until these are merged.",
+            e, [(d["_id"], d["count"]) for d in duplicates],
+        )
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     ## Starting logic 
-    db_instance.client = AsyncIOMotorClient(settings.mongodb_url)
+    client = connect_to_mongo()
     print("Succesfully Connected to MongoDB")
 
+    # Unique email index lets /auth/register rely on insert_one to reject duplicates
+    await ensure_unique_email_index(client[settings.database_name]["users"])
+
     yield
 
     db_instance.client.close()
     print("MongoDB connection closed")
 
 
-app = FastAPI(title="FastAPI Mongo Auth",lifespan=lifespan)
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials= True,
-    allow_methods = ["*"],
-    allow_headers = ["*"],
-)
-app.include_router(auth.router)
-
-@app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    print("❌ Validation Error:")
-    print(exc.errors())  # This will print in your terminal
-    print("📦 Request body:", await request.body())
-    return JSONResponse(
+    if logger.isEnabledFor(logging.DEBUG):
+        body = (await request.body())[:1024]
+        logger.debug("Validation error: %s; request body: %r", exc.errors(), body)
+    return ORJSONResponse(
         status_code=422,
         content={"detail": exc.errors()}
     )
+
+
+app = FastAPI(
+    title="FastAPI Mongo Auth",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+    exception_handlers={RequestValidationError: validation_exception_handler},
+)
+app.add_middleware(CORSMiddleware, **CORS_KWARGS)
+app.include_router(auth.router)
\ No newline at end of file
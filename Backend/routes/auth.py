@@ -1,33 +1,37 @@
+import asyncio
 from fastapi import APIRouter , HTTPException , Depends , status
+from pymongo.errors import DuplicateKeyError
 from schemas.user import UserCreate, Userlogin , Token
 from core.security import hash_password , verify_password , create_access_token
 from db.mongodb import get_database
+from core.deps import get_current_user, invalidate_user
 
 router = APIRouter(prefix="/auth",tags=["Authentication"])
 
 @router.post("/register", status_code=status.HTTP_201_CREATED)
 async def signup(user_in: UserCreate, db = Depends(get_database)):
     
-    # 1. Check if user exists
-    user_exists = await db["users"].find_one({'email': user_in.email})
-    if user_exists:
-        raise HTTPException(status_code=400, detail="User with this email already exists")
-    
-    # 2. Convert Pydantic model to dict
+    # 1. Convert Pydantic model to dict
     user_dict = user_in.model_dump()
 
-    # 3. Replace plain password with hashed password
-    user_dict["password"] = hash_password(user_in.password)
+    # 2. Replace plain password with hashed password
+    # bcrypt is CPU-bound, so run it off the event loop
+    user_dict["password"] = await asyncio.to_thread(hash_password, user_in.password)
 
-    # 4. Insert into MongoDB
-    result = await db["users"].insert_one(user_dict)
+    # 3. Insert into MongoDB (the unique email index rejects existing users)
+    try:
+        result = await db["users"].insert_one(user_dict)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="User with this email already exists")
+    invalidate_user(user_in.email)
     
-    # 5. Create access token for auto-login
+    # 4. Create access token for auto-login
     access_token = create_access_token(data={"sub": user_in.email})
     
-    # 6. Prepare user data for response (remove password)
-    user_response = {k: v for k, v in user_dict.items() if k != "password"}
-    user_response["_id"] = str(result.inserted_id)
+    # 5. Prepare user data for response (remove password)
+    user_dict.pop("password", None)
+    user_dict["_id"] = str(result.inserted_id)
+    user_response = user_dict
     
     return {
         "message": "User registered successfully",
@@ -39,10 +43,13 @@ async def signup(user_in: UserCreate, db = Depends(get_database)):
 @router.post("/login",response_model=Token)
 async def login(user_in:Userlogin,db= Depends(get_database)):
     ## Finding the  user 
-    user = await db["users"].find_one({"email":user_in.email})
+    user = await db["users"].find_one(
+        {"email":user_in.email},
+        projection={"_id": 0, "email": 1, "password": 1}
+    )
 
     ## Verifying the password 
-    if not user or not verify_password(user_in.password,user["password"]):
+    if not user or not await asyncio.to_thread(verify_password, user_in.password, user["password"]):
         raise HTTPException(status_code=401,detail="Incorrect email or password")
     
     ##Create Token 
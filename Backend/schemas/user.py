@@ -1,9 +1,26 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic import AfterValidator, BaseModel, ConfigDict, StringConstraints
+from typing import Annotated, Optional
+
+
+def _lowercase_domain(email: str) -> str:
+    """Lowercase the domain part, as EmailStr did, so stored emails keep matching"""
+    local, _, domain = email.rpartition("@")
+    return f"{local}@{domain.lower()}"
+
+
+# Lightweight email check compiled once into pydantic-core, instead of the
+# email-validator library that EmailStr runs on every request
+Email = Annotated[
+    str,
+    StringConstraints(pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$", max_length=254, strip_whitespace=True),
+    AfterValidator(_lowercase_domain),
+]
 
 class UserCreate(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     name: str
-    email: EmailStr
+    email: Email
     password: str
     nid: str
     age: str
@@ -17,7 +34,9 @@ class UserCreate(BaseModel):
     ward: str
 
 class Userlogin(BaseModel):
-    email: EmailStr
+    model_config = ConfigDict(extra="ignore")
+
+    email: Email
     password: str
 
 class Token(BaseModel):
@@ -13,6 +13,9 @@ class Settings(BaseSettings):
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
 
+    # HITL session storage (in-memory when empty)
+    redis_url: str = os.getenv("REDIS_URL", "")
+
     # CORS
     cors_origins: list = ["*"]
 
@@ -1,12 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from api.routes import law_explanation, letter_generation, bias_detection, pdf_processing, supabase_auth, bias_detection_hitl, chat_history
 from api.core.config import settings
 
 app = FastAPI(
     title="Nepal Justice Weaver API",
     description="API for Law Explanation and Letter Generation modules with Supabase Auth.",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS Configuration
@@ -14,8 +16,8 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PATCH", "DELETE"],
+    allow_headers=["Authorization", "Content-Type"],
 )
 
 # Include Routers
@@ -79,28 +79,19 @@ def split_into_sentences(text: str) -> List[str]:
     return cleaned
 
 
-def run_bias_detection(text: str, confidence_threshold: float) -> BiasDetectionResponse:
-    """Core bias detection logic reused by single and batch endpoints."""
-    if classifier is None:
-        raise HTTPException(
-            status_code=503,
-            detail="Bias detection model is not available. Please check server logs."
-        )
-
-    sentences = split_into_sentences(text)
-
-    if not sentences:
-        return BiasDetectionResponse(
-            success=True,
-            total_sentences=0,
-            biased_count=0,
-            neutral_count=0,
-            results=[],
-            error="No valid sentences found in the provided text."
-        )
+def _no_sentences_response() -> BiasDetectionResponse:
+    return BiasDetectionResponse(
+        success=True,
+        total_sentences=0,
+        biased_count=0,
+        neutral_count=0,
+        results=[],
+        error="No valid sentences found in the provided text."
+    )
 
-    predictions = classifier(sentences)
 
+def _build_bias_response(sentences: List[str], predictions: List[dict], confidence_threshold: float) -> BiasDetectionResponse:
+    """Turn classifier predictions for a list of sentences into a response."""
     results: List[BiasResult] = []
     biased_count = 0
     neutral_count = 0
@@ -133,6 +124,54 @@ def run_bias_detection(text: str, confidence_threshold: float) -> BiasDetectionR
     )
 
 
+def _require_classifier():
+    if classifier is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Bias detection model is not available. Please check server logs."
+        )
+
+
+def run_bias_detection(text: str, confidence_threshold: float) -> BiasDetectionResponse:
+    """Core bias detection logic reused by single and batch endpoints."""
+    _require_classifier()
+
+    sentences = split_into_sentences(text)
+
+    if not sentences:
+        return _no_sentences_response()
+
+    predictions = classifier(sentences)
+
+    return _build_bias_response(sentences, predictions, confidence_threshold)
+
+
+def run_bias_detection_batch(texts: List[str], confidence_threshold: float) -> List[BiasDetectionResponse]:
+    """
+    Run bias detection for several texts with a single classifier call.
+
+    Sentences from all texts are classified together so the pipeline can
+    batch them, then regrouped into one response per input text.
+    """
+    _require_classifier()
+
+    sentences_per_text = [split_into_sentences(text) for text in texts]
+    all_sentences = [s for sentences in sentences_per_text for s in sentences]
+    predictions = classifier(all_sentences) if all_sentences else []
+
+    responses: List[BiasDetectionResponse] = []
+    offset = 0
+    for sentences in sentences_per_text:
+        if not sentences:
+            responses.append(_no_sentences_response())
+            continue
+        end = offset + len(sentences)
+        responses.append(_build_bias_response(sentences, predictions[offset:end], confidence_threshold))
+        offset = end
+
+    return responses
+
+
 def generate_debiased_sentence(payload: DebiasSentenceRequest) -> DebiasSentenceResponse:
     """Use Mistral to suggest a bias-free rewrite for a sentence."""
     if mistral_client is None or mistral_client.client is None:
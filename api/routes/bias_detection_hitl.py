@@ -6,6 +6,7 @@ Handles the interactive workflow for bias detection with human approval
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
 from fastapi.responses import Response
 from api.core.deps import get_current_user
+from api.core.config import settings
 import fitz  # PyMuPDF
 from api.schemas import (
     StartReviewResponse,
@@ -18,11 +19,12 @@ from api.schemas import (
     BiasReviewItem,
     DebiasSentenceRequest,
 )
-from api.routes.bias_detection import run_bias_detection, generate_debiased_sentence
+from api.routes.bias_detection import run_bias_detection_batch, generate_debiased_sentence
 from utility.pdf_processor import PDFProcessor
-from utility.hitl_session_manager import HITLSessionManager
+from utility.hitl_session_manager import create_session_manager
 from utility.pdf_regenerator import PDFRegenerator
 from typing import Optional
+import asyncio
 import uuid
 import logging
 
@@ -30,8 +32,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# Initialize global session manager
-session_manager = HITLSessionManager()
+# Initialize global session manager (Redis-backed when REDIS_URL is set).
+# Its methods block on Redis I/O, so routes call them via asyncio.to_thread.
+session_manager = create_session_manager(settings.redis_url)
 
 # Initialize PDF processor
 pdf_processor = PDFProcessor()
@@ -39,8 +42,11 @@ pdf_processor = PDFProcessor()
 # Initialize PDF regenerator
 pdf_regenerator = PDFRegenerator()
 
+# Maximum number of concurrent LLM calls when generating suggestions
+SUGGESTION_CONCURRENCY = 8
 
-@router.post("/start-review", response_model=StartReviewResponse)
+
+@router.post("/start-review", response_model=StartReviewResponse, response_model_exclude_none=True)
 async def start_bias_review(
     file: UploadFile = File(...),
     refine_with_llm: bool = Form(True),
@@ -63,8 +69,9 @@ async def start_bias_review(
         # Read PDF bytes
         pdf_content = await file.read()
 
-        # Process PDF to extract sentences
-        result = pdf_processor.process_pdf_from_bytes(
+        # Process PDF to extract sentences (blocking, so keep it off the event loop)
+        result = await asyncio.to_thread(
+            pdf_processor.process_pdf_from_bytes,
             pdf_bytes=pdf_content,
             refine_with_llm=refine_with_llm
         )
@@ -84,12 +91,14 @@ async def start_bias_review(
                 detail="No sentences could be extracted from the PDF"
             )
 
-        # Run bias detection on each sentence individually
+        # Run bias detection on all sentences in one batched classifier call
         logger.info(f"Running bias detection on {len(sentences)} sentences")
         all_bias_results = []
 
-        for sentence in sentences:
-            bias_detection_result = run_bias_detection(sentence, confidence_threshold)
+        bias_detection_results = await asyncio.to_thread(
+            run_bias_detection_batch, sentences, confidence_threshold
+        )
+        for sentence, bias_detection_result in zip(sentences, bias_detection_results):
             if bias_detection_result.success and bias_detection_result.results:
                 # Each sentence gets analyzed separately
                 all_bias_results.extend(bias_detection_result.results)
@@ -104,37 +113,36 @@ async def start_bias_review(
 
         logger.info(f"Bias detection completed. Found {len(all_bias_results)} results")
 
+        # Generate debiased suggestions for all biased sentences concurrently
+        semaphore = asyncio.Semaphore(SUGGESTION_CONCURRENCY)
+
+        async def suggest(bias_result) -> Optional[str]:
+            debias_request = DebiasSentenceRequest(
+                sentence=bias_result.sentence,
+                category=bias_result.category,
+                context=None
+            )
+            async with semaphore:
+                debias_response = await asyncio.to_thread(generate_debiased_sentence, debias_request)
+            return debias_response.suggestion if debias_response.success else None
+
+        biased_results = [r for r in all_bias_results if r.is_biased]
+        suggestions = await asyncio.gather(*(suggest(r) for r in biased_results))
+        suggestion_by_result = {id(r): s for r, s in zip(biased_results, suggestions)}
+
         # Create review items with suggestions for biased sentences
         review_items = []
-        biased_count = 0
-        neutral_count = 0
+        biased_count = len(biased_results)
+        neutral_count = len(all_bias_results) - biased_count
 
         for bias_result in all_bias_results:
-            sentence_id = str(uuid.uuid4())
-
-            # Generate suggestion for biased sentences
-            suggestion = None
-            if bias_result.is_biased:
-                biased_count += 1
-                # Generate debiased suggestion
-                debias_request = DebiasSentenceRequest(
-                    sentence=bias_result.sentence,
-                    category=bias_result.category,
-                    context=None
-                )
-                debias_response = generate_debiased_sentence(debias_request)
-                if debias_response.success:
-                    suggestion = debias_response.suggestion
-            else:
-                neutral_count += 1
-
             review_item = BiasReviewItem(
-                sentence_id=sentence_id,
+                sentence_id=str(uuid.uuid4()),
                 original_sentence=bias_result.sentence,
                 is_biased=bias_result.is_biased,
                 category=bias_result.category,
                 confidence=bias_result.confidence,
-                suggestion=suggestion,
+                suggestion=suggestion_by_result.get(id(bias_result)),
                 approved_suggestion=None,
                 status="pending" if bias_result.is_biased else "approved"  # Auto-approve neutral
             )
@@ -142,7 +150,8 @@ async def start_bias_review(
             review_items.append(review_item)
 
         # Create session with PDF bytes for regeneration
-        session = session_manager.create_session(
+        session = await asyncio.to_thread(
+            session_manager.create_session,
             filename=file.filename,
             sentences=review_items,
             raw_text=raw_text,
@@ -168,7 +177,7 @@ async def start_bias_review(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/approve-suggestion", response_model=ApprovalResponse)
+@router.post("/approve-suggestion", response_model=ApprovalResponse, response_model_exclude_none=True)
 async def approve_suggestion(
     request: ApprovalRequest,
     user: dict = Depends(get_current_user)
@@ -181,13 +190,14 @@ async def approve_suggestion(
     - "reject": Mark for regeneration
     """
     try:
-        session = session_manager.get_session(request.session_id)
+        session = await asyncio.to_thread(session_manager.get_session, request.session_id, include_pdf=False)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
 
         if request.action == "approve":
             # Approve the suggestion
-            success = session_manager.update_sentence_status(
+            success = await asyncio.to_thread(
+                session_manager.update_sentence_status,
                 session_id=request.session_id,
                 sentence_id=request.sentence_id,
                 status="approved",
@@ -205,7 +215,8 @@ async def approve_suggestion(
 
         elif request.action == "reject":
             # Mark for regeneration
-            success = session_manager.update_sentence_status(
+            success = await asyncio.to_thread(
+                session_manager.update_sentence_status,
                 session_id=request.session_id,
                 sentence_id=request.sentence_id,
                 status="needs_regeneration",
@@ -240,7 +251,7 @@ async def regenerate_suggestion(
     Regenerate a new suggestion for a rejected sentence using LLM.
     """
     try:
-        session = session_manager.get_session(request.session_id)
+        session = await asyncio.to_thread(session_manager.get_session, request.session_id, include_pdf=False)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
 
@@ -270,7 +281,8 @@ async def regenerate_suggestion(
             )
 
         # Update the session with new suggestion
-        success = session_manager.update_sentence_suggestion(
+        success = await asyncio.to_thread(
+            session_manager.update_sentence_suggestion,
             session_id=request.session_id,
             sentence_id=request.sentence_id,
             new_suggestion=debias_response.suggestion
@@ -307,13 +319,13 @@ async def generate_debiased_pdf(
     - Returns a .txt file with biased sentences replaced by approved suggestions
     """
     try:
-        session = session_manager.get_session(request.session_id)
+        session = await asyncio.to_thread(session_manager.get_session, request.session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
 
         # Check if session is ready for final generation
-        if not session_manager.is_session_ready_for_pdf(request.session_id):
-            stats = session_manager.get_session_stats(request.session_id)
+        if not await asyncio.to_thread(session_manager.is_session_ready_for_pdf, request.session_id):
+            stats = await asyncio.to_thread(session_manager.get_session_stats, request.session_id)
             raise HTTPException(
                 status_code=400,
                 detail=f"Not all sentences have been reviewed. Pending: {stats['pending_count']}, "
@@ -346,7 +358,7 @@ async def generate_debiased_pdf(
         changes_count = sum(1 for detail in sentence_details if detail.get("was_modified", False))
 
         # Mark session as completed
-        session_manager.mark_session_completed(request.session_id)
+        await asyncio.to_thread(session_manager.mark_session_completed, request.session_id)
 
         logger.info(f"Generated debiased PDF for session {request.session_id} with {changes_count} changes")
 
@@ -372,7 +384,7 @@ async def generate_debiased_pdf(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/session/{session_id}", response_model=SessionStatusResponse)
+@router.get("/session/{session_id}", response_model=SessionStatusResponse, response_model_exclude_none=True)
 async def get_session_status(
     session_id: str,
     user: dict = Depends(get_current_user)
@@ -386,11 +398,11 @@ async def get_session_status(
     - All sentences with their current status
     """
     try:
-        session = session_manager.get_session(session_id)
+        session = await asyncio.to_thread(session_manager.get_session, session_id, include_pdf=False)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
 
-        stats = session_manager.get_session_stats(session_id)
+        stats = await asyncio.to_thread(session_manager.get_session_stats, session_id)
 
         return SessionStatusResponse(
             success=True,
@@ -415,7 +427,7 @@ async def hitl_health_check():
     """
     Check if the HITL service is running properly.
     """
-    active_sessions = len(session_manager.get_all_sessions())
+    active_sessions = await asyncio.to_thread(session_manager.count_sessions)
 
     return {
         "status": "healthy",
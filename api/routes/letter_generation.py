@@ -1,4 +1,7 @@
+import asyncio
+
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from api.core.deps import get_current_user
 from api.schemas import (
     LetterGenerationRequest, LetterGenerationResponse,
@@ -44,7 +47,7 @@ async def generate_letter(request: LetterGenerationRequest, user: dict = Depends
         # For simplicity, we assume the user might want to generate directly
         # If additional_data is provided, we use it.
         
-        result = letter_api.generate_smart_letter(
+        result = await letter_api.agenerate_smart_letter(
             description=request.description,
             template_name=request.template_name,
             additional_data=request.additional_data
@@ -54,6 +57,24 @@ async def generate_letter(request: LetterGenerationRequest, user: dict = Depends
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/generate-letter/stream")
+async def generate_letter_stream(request: LetterGenerationRequest, user: dict = Depends(get_current_user)):
+    try:
+        # Template selection embeds the query and searches the vector DB, so run
+        # it off the event loop; StreamingResponse iterates the chunks in a threadpool
+        chunks = await asyncio.to_thread(
+            letter_api.stream_smart_letter,
+            description=request.description,
+            template_name=request.template_name,
+            additional_data=request.additional_data
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return StreamingResponse(chunks, media_type="text/plain; charset=utf-8")
+
 @router.post("/analyze-requirements", response_model=LetterGenerationResponse)
 async def analyze_requirements(request: LetterGenerationRequest):
     try:
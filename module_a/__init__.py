@@ -5,8 +5,15 @@ Nepal Justice Weaver - Hackathon Project
 This module implements the RAG-based law explanation feature.
 """
 
-from .interface import LawExplanationAPI
-
 __all__ = ['LawExplanationAPI']
 
+
+def __getattr__(name):
+    # Imported lazily so lightweight submodules (config, diagnostics) don't
+    # pull in the embedding model and vector DB clients
+    if name == 'LawExplanationAPI':
+        from .interface import LawExplanationAPI
+        return LawExplanationAPI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 __version__ = "0.1.0"
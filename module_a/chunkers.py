@@ -13,7 +13,8 @@ from .config import (
     CHUNK_SIZE_MAX_WORDS,
     CHUNK_SIZE_TARGET_WORDS,
     CHUNK_OVERLAP_WORDS,
-    COMPILED_SECTION_PATTERNS
+    COMPILED_SECTION_UNION,
+    classify_match
 )
 from .models import DocumentChunk, ChunkMetadata
 
@@ -93,58 +94,41 @@ class LegalDocumentChunker:
         """
         sections = []
         current_section = None
-        current_text = []
-        
-        lines = text.split('\n')
-        
-        for line in lines:
-            # Check if line contains a section marker
-            section_match = self._detect_section(line)
+        current_start = 0
+        
+        # COMPILED_SECTION_UNION is multiline, so one scan over the whole text
+        # finds every marker line without splitting the document into lines
+        for match in COMPILED_SECTION_UNION.finditer(text):
+            start = match.start()
+            # Save previous section (text up to the newline before this marker)
+            if start > 0:
+                sections.append((current_section, text[current_start:start - 1]))
             
-            if section_match:
-                # Save previous section if it has content
-                if current_text:
-                    sections.append((current_section, '\n'.join(current_text)))
-                    current_text = []
-                
-                # Start new section with this title
-                current_section = section_match
-                # Include the section header line in the text
-                current_text = [line]
-            else:
-                current_text.append(line)
-        
-        # Add final section
-        if current_text:
-            sections.append((current_section, '\n'.join(current_text)))
+            # Start new section with this title; the header line stays in its text
+            current_section = self._section_title(match)
+            current_start = start
         
-        # If no sections detected, return entire text as one section
-        if len(sections) == 0:
-            sections.append((None, text))
+        # Add final section (or the entire text when no sections were detected)
+        sections.append((current_section, text[current_start:]))
         
         logger.info(f"Detected {len(sections)} sections in document")
         
         return sections
     
-    def _detect_section(self, line: str) -> Optional[str]:
+    def _section_title(self, match) -> str:
         """
-        Detect if a line contains a section/article marker
+        Build a section title from a COMPILED_SECTION_UNION match
         
         Returns:
-            Section title if detected, None otherwise
+            Section title for the detected marker
         """
-        for pattern in COMPILED_SECTION_PATTERNS:
-            match = pattern.search(line)
-            if match:
-                # For numbered sections like "11. Citizenship:", return "11. Citizenship"
-                if len(match.groups()) >= 2:
-                    # Pattern has both number and title
-                    return f"{match.group(1)}. {match.group(2)}"
-                else:
-                    # Pattern has just the identifier, return the full match
-                    return match.group(0)
+        kind, _ = classify_match(match)
+        if kind == "numbered":
+            # For numbered sections like "11. Citizenship:", return "11. Citizenship"
+            return f"{match.group('numbered_num')}. {match.group('numbered_title')}"
         
-        return None
+        # Other markers return the full match
+        return match.group(0)
     
     def _chunk_section(
         self,
@@ -7,7 +7,7 @@ import re
 import logging
 from typing import List, Dict
 
-from .config import CLEANING_PATTERNS
+from .config import COMPILED_CLEANING_PATTERNS
 
 logger = logging.getLogger(__name__)
 
@@ -17,14 +17,7 @@ class TextCleaner:
     
     def __init__(self):
         """Initialize text cleaner with compiled patterns"""
-        self.patterns = self._compile_patterns()
-    
-    def _compile_patterns(self) -> Dict[str, List[re.Pattern]]:
-        """Compile all regex patterns for efficiency"""
-        compiled = {}
-        for category, patterns in CLEANING_PATTERNS.items():
-            compiled[category] = [re.compile(p, re.MULTILINE | re.IGNORECASE) for p in patterns]
-        return compiled
+        self.patterns = COMPILED_CLEANING_PATTERNS
     
     def clean_text(self, text: str) -> str:
         """
@@ -58,21 +51,15 @@ class TextCleaner:
     
     def _remove_page_numbers(self, text: str) -> str:
         """Remove page numbers"""
-        for pattern in self.patterns['page_numbers']:
-            text = pattern.sub('', text)
-        return text
+        return self.patterns['page_numbers'].sub('', text)
     
     def _remove_headers_footers(self, text: str) -> str:
         """Remove common headers and footers"""
-        for pattern in self.patterns['headers_footers']:
-            text = pattern.sub('', text)
-        return text
+        return self.patterns['headers_footers'].sub('', text)
     
     def _remove_toc_patterns(self, text: str) -> str:
         """Remove table of contents patterns"""
-        for pattern in self.patterns['toc_patterns']:
-            text = pattern.sub('', text)
-        return text
+        return self.patterns['toc_patterns'].sub('', text)
     
     def _normalize_whitespace(self, text: str) -> str:
         """Fix excessive whitespace and line breaks"""
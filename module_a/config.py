@@ -4,26 +4,45 @@ Contains all settings, paths, and parameters
 """
 
 import os
+from collections import ChainMap
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 import re
 
-# Load environment variables from .env file if it exists
+# Prefer RE2 (linear-time matching, no catastrophic backtracking) when the
+# google-re2 package is installed; fall back to the standard library.
 try:
-    from dotenv import load_dotenv
-    # Load .env from project root (parent of module_a)
-    _BASE_DIR = Path(__file__).parent.parent
-    env_file = _BASE_DIR / ".env"
-    if env_file.exists():
-        load_dotenv(env_file)
-    else:
-        # Also try loading from current directory
-        load_dotenv()
+    import re2 as _re_engine
+    RE2_AVAILABLE = True
 except ImportError:
-    # python-dotenv not installed, skip .env loading
-    pass
+    _re_engine = re
+    RE2_AVAILABLE = False
+
+# .env in the project root (parent of module_a)
+ENV_FILE_PATH = (Path(__file__).parent.parent / ".env").resolve()
+
+
+@lru_cache(maxsize=None)
+def _load_env_once() -> None:
+    """Load environment variables from .env once per process (later calls are no-ops)"""
+    try:
+        from dotenv import load_dotenv
+        if ENV_FILE_PATH.exists():
+            load_dotenv(ENV_FILE_PATH)
+        else:
+            # Also try loading from current directory
+            load_dotenv()
+    except ImportError:
+        # python-dotenv not installed, skip .env loading
+        pass
+
 
-# Base paths
-BASE_DIR = Path(__file__).parent.parent
+# Load environment variables from .env file if it exists
+_load_env_once()
+
+# Base paths (resolved once at import)
+BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR / "data" / "module-A"
 LAW_DIR = DATA_DIR / "law"
 CHUNKS_DIR = DATA_DIR / "chunks"
@@ -47,38 +66,38 @@ CHUNK_SIZE_MIN_TOKENS = int(CHUNK_SIZE_MIN_WORDS * 1.3)
 CHUNK_SIZE_MAX_TOKENS = int(CHUNK_SIZE_MAX_WORDS * 1.3)
 
 # Text cleaning patterns
-CLEANING_PATTERNS = {
+CLEANING_PATTERNS = MappingProxyType({
     # Page numbers (various formats)
-    'page_numbers': [
+    'page_numbers': (
         r'^\s*\d+\s*$',  # Standalone numbers
         r'Page\s+\d+',
         r'पृष्ठ\s+\d+',
-    ],
+    ),
     
     # Headers and footers
-    'headers_footers': [
+    'headers_footers': (
         r'www\..*?\.gov\.np',
         r'Constitution of Nepal.*?\d{4}',
         r'Nepal Gazette.*?Part.*?\d+',
         r'©.*?Government of Nepal',
-    ],
+    ),
     
     # Table of contents patterns
-    'toc_patterns': [
+    'toc_patterns': (
         r'Table of Contents',
         r'CONTENTS',
         r'विषयसूची',
-    ],
+    ),
     
     # Excessive whitespace
-    'whitespace': [
+    'whitespace': (
         r'\n\s*\n\s*\n+',  # Multiple blank lines
         r'[ \t]+',  # Multiple spaces/tabs
-    ],
-}
+    ),
+})
 
 # Section/Article detection patterns
-SECTION_PATTERNS = [
+SECTION_PATTERNS = (
     # Numbered sections at start of line: "11. Right to citizenship:"
     r'^\s*(\d+[A-Za-z]?)\.\s+([A-Z][^:]+):',
     
@@ -97,10 +116,69 @@ SECTION_PATTERNS = [
     # Nepali patterns (if needed later)
     r'^\s*धारा\s+(\d+[A-Za-z]?)',
     r'^\s*अनुच्छेद\s+(\d+[A-Za-z]?)',
-]
+)
+
+
+# RE2's \d and \s are ASCII-only, while re matches any Unicode digit/space in
+# str patterns (Devanagari numerals like "धारा ५", NBSP). These replacements
+# give RE2 the same classes. Patterns only use \d, \s and [^\S\n] outside
+# other character classes, so plain textual substitution is enough.
+_RE2_UNICODE_CLASSES = (
+    (r'[^\S\n]', r'[\t\v\f\r\x{1c}-\x{1f}\x{85}\p{Z}]'),
+    (r'\s', r'[\t\n\v\f\r\x{1c}-\x{1f}\x{85}\p{Z}]'),
+    (r'\d', r'\p{Nd}'),
+)
+
+
+def _compile_pattern(pattern: str, flags: str = "i", engine=None):
+    """Compile a pattern with the active regex engine using inline flags (portable across re/re2)"""
+    engine = engine or _re_engine
+    if engine is not re:
+        for ascii_class, unicode_class in _RE2_UNICODE_CLASSES:
+            pattern = pattern.replace(ascii_class, unicode_class)
+    return engine.compile(f"(?{flags}){pattern}")
+
+
+# All section patterns fused into one alternation, anchored at line starts so a
+# single finditer over the whole document finds every marker. The outer named
+# group tells which kind of marker matched (see classify_match); "<kind>_num"
+# holds its number. Whitespace is [^\S\n] so a match never runs across lines.
+SECTION_UNION_PATTERN = (
+    r'^[^\S\n]*(?:'
+    r'(?P<numbered>(?P<numbered_num>\d+[A-Za-z]?)\.[^\S\n]+(?P<numbered_title>[A-Z][^:\n]+):)'
+    r'|(?P<article>(?:Article|ARTICLE)[^\S\n]+(?P<article_num>\d+[A-Za-z]?))'
+    r'|(?P<section>(?:Section|SECTION)[^\S\n]+(?P<section_num>\d+[A-Za-z]?))'
+    r'|(?P<part>(?:Part|PART)[^\S\n]+(?P<part_num>\d+[A-Za-z]?))'
+    r'|(?P<chapter>(?:Chapter|CHAPTER)[^\S\n]+(?P<chapter_num>\d+[A-Za-z]?))'
+    r'|(?P<dhara>धारा[^\S\n]+(?P<dhara_num>\d+[A-Za-z]?))'
+    r'|(?P<anucched>अनुच्छेद[^\S\n]+(?P<anucched_num>\d+[A-Za-z]?))'
+    r')'
+)
+
+# COMPILED_SECTION_PATTERNS and COMPILED_SECTION_UNION are compiled on first
+# access (see __getattr__ below) so importing config stays cheap
+_LAZY_COMPILED = {
+    "COMPILED_SECTION_PATTERNS": lambda: tuple(_compile_pattern(pattern) for pattern in SECTION_PATTERNS),
+    "COMPILED_SECTION_UNION": lambda: _compile_pattern(SECTION_UNION_PATTERN, "im"),
+}
+
 
-# Compile regex patterns for efficiency
-COMPILED_SECTION_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in SECTION_PATTERNS]
+def classify_match(match) -> tuple:
+    """
+    Identify which section marker a COMPILED_SECTION_UNION match found
+
+    Returns:
+        (kind, number) tuple, e.g. ("article", "11")
+    """
+    kind = match.lastgroup
+    return kind, match.group(f"{kind}_num")
+
+
+# One alternation per cleaning category, so each category is a single pass over the text
+COMPILED_CLEANING_PATTERNS = {
+    category: _compile_pattern("|".join(f"(?:{p})" for p in patterns), "im")
+    for category, patterns in CLEANING_PATTERNS.items()
+}
 
 # Logging configuration
 LOG_LEVEL = "INFO"
@@ -121,11 +199,21 @@ EMBEDDING_BATCH_SIZE = 32
 
 # Pinecone settings - Read from environment or set here
 # Get your API key from: https://app.pinecone.io/
-PINECONE_API_KEY = os.getenv("PINECONE_API_KEY", "")
-PINECONE_INDEX_NAME = os.getenv("PINECONE_INDEX_NAME", "nepal-legal-docs")
+# PINECONE_API_KEY / PINECONE_INDEX_NAME are resolved on access through
+# SETTINGS (see __getattr__ below), so later changes to os.environ are seen.
+_ENV_DEFAULTS = {
+    "PINECONE_API_KEY": "",
+    "PINECONE_INDEX_NAME": "nepal-legal-docs",
+}
+SETTINGS = ChainMap(os.environ, _ENV_DEFAULTS)
 PINECONE_TEXT_STORAGE_FILE = DATA_DIR / "pinecone_text_storage.json"
 
 
+def env(name: str, default: str = "") -> str:
+    """Read a setting from the environment, falling back to the defaults above"""
+    return SETTINGS.get(name, default)
+
+
 # Retrieval settings
 DEFAULT_RETRIEVAL_K = 5  # Number of chunks to retrieve
 
@@ -133,3 +221,18 @@ DEFAULT_RETRIEVAL_K = 5  # Number of chunks to retrieve
 MISTRAL_MODEL = "mistral-tiny"  # Options: mistral-tiny, mistral-small, mistral-medium
 MISTRAL_API_KEY_ENV_VAR = "MISTRAL_API_KEY"
 
+
+def mask_secret(secret: str) -> str:
+    """Mask an API key for display, keeping only its first 8 and last 4 characters"""
+    return f"{secret[:8]}...{secret[-4:]}" if len(secret) > 12 else "***"
+
+
+def __getattr__(name: str):
+    """Resolve environment-backed settings and compiled patterns lazily (PEP 562)"""
+    if name in _ENV_DEFAULTS:
+        return SETTINGS[name]
+    if name in _LAZY_COMPILED:
+        # Cache in module globals so later lookups skip __getattr__
+        value = globals()[name] = _LAZY_COMPILED[name]()
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -56,7 +56,8 @@ class EmbeddingGenerator:
         self,
         texts: List[str],
         batch_size: int = EMBEDDING_BATCH_SIZE,
-        show_progress: bool = True
+        show_progress: bool = True,
+        normalize: bool = False
     ) -> np.ndarray:
         """
         Generate embeddings for multiple texts efficiently
@@ -65,6 +66,7 @@ class EmbeddingGenerator:
             texts: List of input texts
             batch_size: Batch size for processing
             show_progress: Whether to show progress bar
+            normalize: Whether to L2-normalize each embedding
             
         Returns:
             Numpy array of shape (len(texts), embedding_dim)
@@ -75,7 +77,8 @@ class EmbeddingGenerator:
             texts,
             batch_size=batch_size,
             show_progress_bar=show_progress,
-            convert_to_numpy=True
+            convert_to_numpy=True,
+            normalize_embeddings=normalize
         )
         
         logger.info(f"Generated {len(embeddings)} embeddings of dimension {self.embedding_dim}")
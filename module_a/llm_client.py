@@ -3,10 +3,8 @@ Mistral API Client Module
 Handles interaction with Mistral AI models
 """
 
-import os
 import logging
 from typing import Optional, List, Dict, Any
-from dotenv import load_dotenv
 
 try:
     # New SDK structure (v1.0+)
@@ -17,12 +15,12 @@ except ImportError as e:
     print(f"DEBUG: Mistral import failed: {e}")
     MISTRAL_AVAILABLE = False
 
-from .config import MISTRAL_MODEL, MISTRAL_API_KEY_ENV_VAR
+from .config import MISTRAL_MODEL, MISTRAL_API_KEY_ENV_VAR, _load_env_once, env
 
 logger = logging.getLogger(__name__)
 
 # Load environment variables from .env file if present
-load_dotenv()
+_load_env_once()
 
 
 class MistralClient:
@@ -42,7 +40,7 @@ class MistralClient:
                 "Install with: pip install mistralai"
             )
             
-        self.api_key = api_key or os.getenv(MISTRAL_API_KEY_ENV_VAR)
+        self.api_key = api_key or env(MISTRAL_API_KEY_ENV_VAR)
         self.model = model
         
         if not self.api_key:
@@ -3,10 +3,13 @@ Logging setup for Module A
 Configures both console and file logging with rotation
 """
 
+import atexit
 import logging
 import sys
+import threading
+import time
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import MemoryHandler, RotatingFileHandler
 
 from .config import (
     LOG_LEVEL,
@@ -16,6 +19,71 @@ from .config import (
     LOG_FILE_BACKUP_COUNT
 )
 
+# File log records are buffered and written in batches of up to this many
+# records, at least every LOG_BUFFER_FLUSH_INTERVAL seconds, and immediately
+# for WARNING and above
+LOG_BUFFER_CAPACITY = 512
+LOG_BUFFER_FLUSH_INTERVAL = 2.0
+LOG_BUFFER_FLUSH_LEVEL = logging.WARNING
+
+# Numeric log level, resolved once
+_LOG_LEVEL_INT = logging.getLevelNamesMapping().get(LOG_LEVEL.upper(), logging.INFO)
+
+# Current buffered file handler per logger name, flushed once at exit
+_BUFFERED_HANDLERS = {}
+
+
+class _TimedMemoryHandler(MemoryHandler):
+    """
+    MemoryHandler that also flushes every flush_interval seconds
+
+    A daemon thread flushes the buffer on that schedule, so records logged
+    before an idle period still reach the file within flush_interval.
+    """
+
+    def __init__(self, *args, flush_interval: float = LOG_BUFFER_FLUSH_INTERVAL, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically, name="log-buffer-flush", daemon=True
+        )
+        self._flusher.start()
+
+    def _flush_periodically(self) -> None:
+        while not self._closed.wait(self.flush_interval):
+            if self.buffer:
+                self.flush()
+
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        return (
+            super().shouldFlush(record)
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        )
+
+    def flush(self) -> None:
+        super().flush()
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        self._closed.set()
+        super().close()
+
+
+def _close_handler(handler: logging.Handler) -> None:
+    """Flush and close a handler, including a buffering handler's target"""
+    target = getattr(handler, "target", None)
+    handler.close()
+    if target is not None:
+        target.close()
+
+
+@atexit.register
+def _flush_buffered_handlers() -> None:
+    for handler in _BUFFERED_HANDLERS.values():
+        handler.flush()
+
 
 def setup_logging(module_name: str = "module_a") -> logging.Logger:
     """
@@ -28,17 +96,21 @@ def setup_logging(module_name: str = "module_a") -> logging.Logger:
         Configured logger instance
     """
     logger = logging.getLogger(module_name)
-    logger.setLevel(getattr(logging, LOG_LEVEL.upper(), logging.INFO))
+    logger.setLevel(_LOG_LEVEL_INT)
     
-    # Remove existing handlers to avoid duplicates
-    logger.handlers.clear()
+    # Remove existing handlers to avoid duplicates (flushing buffered records
+    # and releasing their files)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        _close_handler(handler)
+    _BUFFERED_HANDLERS.pop(module_name, None)
     
     # Create formatter
     formatter = logging.Formatter(LOG_FORMAT)
     
     # Console handler (stdout)
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, LOG_LEVEL.upper(), logging.INFO))
+    console_handler.setLevel(_LOG_LEVEL_INT)
     console_handler.setFormatter(formatter)
     logger.addHandler(console_handler)
     
@@ -54,9 +126,18 @@ def setup_logging(module_name: str = "module_a") -> logging.Logger:
                 backupCount=LOG_FILE_BACKUP_COUNT,
                 encoding='utf-8'
             )
-            file_handler.setLevel(getattr(logging, LOG_LEVEL.upper(), logging.INFO))
+            file_handler.setLevel(_LOG_LEVEL_INT)
             file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
+            
+            # Buffer records in memory so bursts of INFO logs don't cost a write each
+            buffered_handler = _TimedMemoryHandler(
+                capacity=LOG_BUFFER_CAPACITY,
+                flushLevel=LOG_BUFFER_FLUSH_LEVEL,
+                target=file_handler
+            )
+            buffered_handler.setLevel(_LOG_LEVEL_INT)
+            logger.addHandler(buffered_handler)
+            _BUFFERED_HANDLERS[module_name] = buffered_handler
             
             logger.info(f"Logging to file: {LOG_FILE}")
         except Exception as e:
@@ -74,16 +155,14 @@ def get_pinecone_logger() -> logging.Logger:
     """
     logger = logging.getLogger("module_a.pinecone")
     
-    # If logger doesn't have handlers, set them up
-    if not logger.handlers:
-        # Use parent logger's handlers
-        parent_logger = logging.getLogger("module_a")
-        if not parent_logger.handlers:
-            setup_logging("module_a")
-        
-        # Copy handlers from parent
-        for handler in logging.getLogger("module_a").handlers:
-            logger.addHandler(handler)
+    # Make sure the parent logger's handlers are set up
+    parent_logger = logging.getLogger("module_a")
+    if not parent_logger.handlers:
+        setup_logging("module_a")
+    
+    # Records reach the parent's handlers through propagation; copying the
+    # handlers here as well would write every record twice
+    logger.propagate = True
     
-    logger.setLevel(getattr(logging, LOG_LEVEL.upper(), logging.INFO))
+    logger.setLevel(_LOG_LEVEL_INT)
     return logger
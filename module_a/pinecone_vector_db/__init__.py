@@ -3,9 +3,15 @@ Pinecone Vector Database Module
 Handles all Pinecone-related functionality for Module A
 """
 
-from .pinecone_vector_db import PineconeLegalVectorDB
-from ..logging_setup import setup_logging, get_pinecone_logger
-
 __all__ = [
     'PineconeLegalVectorDB',
 ]
+
+
+def __getattr__(name):
+    # Imported lazily so the diagnostic scripts in this package start
+    # without loading the Pinecone client
+    if name == 'PineconeLegalVectorDB':
+        from .pinecone_vector_db import PineconeLegalVectorDB
+        return PineconeLegalVectorDB
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,14 +4,15 @@ Run this to verify if Pinecone or ChromaDB is active
 """
 
 import os
+import sys
 import logging
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Importing config loads environment variables from .env (once per process)
+from module_a.config import _load_env_once, env, mask_secret
+_load_env_once()
 
-from module_a.rag_chain import LegalRAGChain
-from module_a.config import PINECONE_API_KEY
+_BAR = "=" * 80
+_SEP = "-" * 80
 
 # Configure logging to see the initialization messages
 logging.basicConfig(
@@ -19,87 +20,110 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+def _flush(out: list) -> None:
+    """Write buffered output lines to stdout in a single call"""
+    if out:
+        sys.stdout.write("\n".join(out) + "\n")
+        sys.stdout.flush()
+        out.clear()
+
+
 def main():
-    print("=" * 80)
-    print("Vector Database Checker")
-    print("=" * 80)
-    print()
+    out: list[str] = []
+    try:
+        return _check(out)
+    finally:
+        _flush(out)
+
+
+def _check(out: list) -> int:
+    out.append(_BAR)
+    out.append("Vector Database Checker")
+    out.append(_BAR)
+    out.append("")
     
     # Check environment
-    print("Environment Check:")
-    print("-" * 80)
-    api_key_set = bool(PINECONE_API_KEY)
-    api_key_from_env = bool(os.getenv("PINECONE_API_KEY"))
+    out.append("Environment Check:")
+    out.append(_SEP)
+    api_key = env("PINECONE_API_KEY")
+    api_key_set = bool(api_key)
+    api_key_from_env = "PINECONE_API_KEY" in os.environ
     
-    print(f"PINECONE_API_KEY in config: {'✓ Set' if api_key_set else '✗ Not set'}")
-    print(f"PINECONE_API_KEY in environment: {'✓ Set' if api_key_from_env else '✗ Not set'}")
+    out.append(f"PINECONE_API_KEY in config: {'✓ Set' if api_key_set else '✗ Not set'}")
+    out.append(f"PINECONE_API_KEY in environment: {'✓ Set' if api_key_from_env else '✗ Not set'}")
     
     if api_key_set:
         # Mask the API key for security
-        masked_key = PINECONE_API_KEY[:8] + "..." + PINECONE_API_KEY[-4:] if len(PINECONE_API_KEY) > 12 else "***"
-        print(f"API Key (masked): {masked_key}")
+        masked_key = mask_secret(api_key)
+        out.append(f"API Key (masked): {masked_key}")
     else:
-        print("\n⚠️  TROUBLESHOOTING:")
-        print("-" * 80)
-        print("The API key is not being detected. Here are possible reasons:")
-        print()
-        print("1. Environment variable not set in current session:")
-        print("   PowerShell: $env:PINECONE_API_KEY='your-key'")
-        print("   CMD:        set PINECONE_API_KEY=your-key")
-        print()
-        print("2. .env file not found or not loaded:")
-        print("   Create a .env file in project root with:")
-        print("   PINECONE_API_KEY=your-key")
-        print()
-        print("3. Environment variable set in different terminal:")
-        print("   Set it in the SAME terminal where you run the application")
-        print()
-        print("4. Need to restart application after setting:")
-        print("   After setting the variable, restart your server/application")
-    print()
+        out.append(f"""
+⚠️  TROUBLESHOOTING:
+{_SEP}
+The API key is not being detected. Here are possible reasons:
+
+1. Environment variable not set in current session:
+   PowerShell: $env:PINECONE_API_KEY='your-key'
+   CMD:        set PINECONE_API_KEY=your-key
+
+2. .env file not found or not loaded:
+   Create a .env file in project root with:
+   PINECONE_API_KEY=your-key
+
+3. Environment variable set in different terminal:
+   Set it in the SAME terminal where you run the application
+
+4. Need to restart application after setting:
+   After setting the variable, restart your server/application""")
+    out.append("")
     
     # Initialize RAG chain (this will show which DB is used)
-    print("Initializing RAG Chain...")
-    print("-" * 80)
+    out.append("Initializing RAG Chain...")
+    out.append(_SEP)
+    # Show the environment report before the (slow) RAG chain initialization
+    _flush(out)
     try:
+        # Imported here so the environment checks above print without
+        # waiting for the embedding model and Pinecone client to load
+        from module_a.rag_chain import LegalRAGChain
         rag_chain = LegalRAGChain()
         
         # Get database info
         db_info = rag_chain.get_vector_db_info()
         
-        print()
-        print("=" * 80)
-        print("RESULT:")
-        print("=" * 80)
-        print(f"Database Type: {db_info['type']}")
-        print(f"Class Name: {db_info['class_name']}")
-        print(f"Is Pinecone: {db_info['is_pinecone']}")
+        out.append("")
+        out.append(_BAR)
+        out.append("RESULT:")
+        out.append(_BAR)
+        out.append(f"Database Type: {db_info['type']}")
+        out.append(f"Class Name: {db_info['class_name']}")
+        out.append(f"Is Pinecone: {db_info['is_pinecone']}")
         
         if db_info['is_pinecone']:
-            print(f"Pinecone Index: {db_info.get('index_name', 'N/A')}")
-            print(f"Vector Count: {db_info.get('vector_count', 0)}")
+            out.append(f"Pinecone Index: {db_info.get('index_name', 'N/A')}")
+            out.append(f"Vector Count: {db_info.get('vector_count', 0)}")
         else:
-            print(f"ChromaDB Directory: {db_info.get('persist_directory', 'N/A')}")
-            print(f"Collection Name: {db_info.get('collection_name', 'N/A')}")
-            print(f"Vector Count: {db_info.get('vector_count', 0)}")
+            out.append(f"ChromaDB Directory: {db_info.get('persist_directory', 'N/A')}")
+            out.append(f"Collection Name: {db_info.get('collection_name', 'N/A')}")
+            out.append(f"Vector Count: {db_info.get('vector_count', 0)}")
         
-        print()
+        out.append("")
         if db_info['is_pinecone']:
-            print("✓ SUCCESS: Using Pinecone cloud vector database")
+            out.append("✓ SUCCESS: Using Pinecone cloud vector database")
         else:
-            print("ℹ INFO: Using ChromaDB local vector database")
-            print("   (To use Pinecone, set PINECONE_API_KEY environment variable)")
+            out.append("ℹ INFO: Using ChromaDB local vector database")
+            out.append("   (To use Pinecone, set PINECONE_API_KEY environment variable)")
         
-        print("=" * 80)
+        out.append(_BAR)
         return 0
         
     except Exception as e:
-        print()
-        print("=" * 80)
-        print("ERROR:")
-        print("=" * 80)
-        print(f"Failed to initialize: {e}")
-        print("=" * 80)
+        out.append("")
+        out.append(_BAR)
+        out.append("ERROR:")
+        out.append(_BAR)
+        out.append(f"Failed to initialize: {e}")
+        out.append(_BAR)
         return 1
 
 
@@ -5,60 +5,69 @@ This will show you exactly what's happening with your environment variables
 
 import os
 import sys
-from pathlib import Path
 
-print("=" * 80)
-print("Pinecone API Key Diagnostic Tool")
-print("=" * 80)
-print()
+# Read before importing config, which loads .env into the environment
+env_value = os.getenv("PINECONE_API_KEY")
+
+from module_a.config import ENV_FILE_PATH as env_file, mask_secret
+
+_BAR = "=" * 80
+_SEP = "-" * 80
+
+# Output lines are collected here and written to stdout once at the end
+out: list[str] = []
+
+out.append(_BAR)
+out.append("Pinecone API Key Diagnostic Tool")
+out.append(_BAR)
+out.append("")
 
 # Check 1: Direct environment variable
-print("1. Checking environment variable directly:")
-print("-" * 80)
-env_value = os.getenv("PINECONE_API_KEY")
+out.append("1. Checking environment variable directly:")
+out.append(_SEP)
 if env_value:
-    masked = env_value[:8] + "..." + env_value[-4:] if len(env_value) > 12 else "***"
-    print(f"   ✓ Found: {masked}")
-    print(f"   Length: {len(env_value)} characters")
+    masked = mask_secret(env_value)
+    out.append(f"   ✓ Found: {masked}")
+    out.append(f"   Length: {len(env_value)} characters")
 else:
-    print("   ✗ NOT FOUND in environment")
-print()
+    out.append("   ✗ NOT FOUND in environment")
+out.append("")
 
 # Check 2: .env file
-print("2. Checking for .env file:")
-print("-" * 80)
-base_dir = Path(__file__).parent.parent
-env_file = base_dir / ".env"
+out.append("2. Checking for .env file:")
+out.append(_SEP)
+env_has_key = False
 if env_file.exists():
-    print(f"   ✓ Found .env file at: {env_file}")
-    # Try to read it
+    out.append(f"   ✓ Found .env file at: {env_file}")
+    # Try to read it, stopping at the first PINECONE_API_KEY line
     try:
-        with open(env_file, 'r') as f:
-            content = f.read()
-            if "PINECONE_API_KEY" in content:
-                print("   ✓ PINECONE_API_KEY found in .env file")
-                # Extract the value (simple parsing)
-                for line in content.split('\n'):
-                    if line.strip().startswith("PINECONE_API_KEY"):
-                        key_part = line.split('=', 1)[1].strip().strip('"').strip("'")
-                        if key_part:
-                            masked = key_part[:8] + "..." + key_part[-4:] if len(key_part) > 12 else "***"
-                            print(f"   Value (masked): {masked}")
+        with open(env_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                stripped = line.strip()
+                if stripped.startswith("PINECONE_API_KEY"):
+                    env_has_key = True
+                    out.append("   ✓ PINECONE_API_KEY found in .env file")
+                    # Extract the value (simple parsing)
+                    key_part = stripped.split('=', 1)[1].strip().strip('"').strip("'") if '=' in stripped else ""
+                    if key_part:
+                        masked = mask_secret(key_part)
+                        out.append(f"   Value (masked): {masked}")
+                    break
             else:
-                print("   ✗ PINECONE_API_KEY NOT found in .env file")
+                out.append("   ✗ PINECONE_API_KEY NOT found in .env file")
     except Exception as e:
-        print(f"   ⚠ Could not read .env file: {e}")
+        out.append(f"   ⚠ Could not read .env file: {e}")
 else:
-    print(f"   ✗ .env file NOT found at: {env_file}")
-    print(f"   Expected location: {env_file}")
-print()
+    out.append(f"   ✗ .env file NOT found at: {env_file}")
+    out.append(f"   Expected location: {env_file}")
+out.append("")
 
 # Check 3: Try loading with dotenv
-print("3. Testing dotenv loading:")
-print("-" * 80)
+out.append("3. Testing dotenv loading:")
+out.append(_SEP)
 try:
     from dotenv import load_dotenv
-    print("   ✓ python-dotenv is installed")
+    out.append("   ✓ python-dotenv is installed")
     
     # Clear the variable first
     if "PINECONE_API_KEY" in os.environ:
@@ -69,54 +78,57 @@ try:
         load_dotenv(env_file, override=True)
         after_load = os.getenv("PINECONE_API_KEY")
         if after_load:
-            masked = after_load[:8] + "..." + after_load[-4:] if len(after_load) > 12 else "***"
-            print(f"   ✓ After loading .env: {masked}")
+            masked = mask_secret(after_load)
+            out.append(f"   ✓ After loading .env: {masked}")
         else:
-            print("   ✗ Still not found after loading .env")
+            out.append("   ✗ Still not found after loading .env")
     else:
-        print("   ⚠ No .env file to load")
+        out.append("   ⚠ No .env file to load")
 except ImportError:
-    print("   ✗ python-dotenv is NOT installed")
-    print("   Install with: pip install python-dotenv")
-print()
+    out.append("   ✗ python-dotenv is NOT installed")
+    out.append("   Install with: pip install python-dotenv")
+out.append("")
 
 # Check 4: What config.py sees
-print("4. What config.py sees:")
-print("-" * 80)
+out.append("4. What config.py sees:")
+out.append(_SEP)
 try:
     # Import after potential dotenv load
     from module_a.config import PINECONE_API_KEY
     if PINECONE_API_KEY:
-        masked = PINECONE_API_KEY[:8] + "..." + PINECONE_API_KEY[-4:] if len(PINECONE_API_KEY) > 12 else "***"
-        print(f"   ✓ config.PINECONE_API_KEY: {masked}")
+        masked = mask_secret(PINECONE_API_KEY)
+        out.append(f"   ✓ config.PINECONE_API_KEY: {masked}")
     else:
-        print("   ✗ config.PINECONE_API_KEY is empty/not set")
+        out.append("   ✗ config.PINECONE_API_KEY is empty/not set")
 except Exception as e:
-    print(f"   ⚠ Error importing config: {e}")
-print()
+    out.append(f"   ⚠ Error importing config: {e}")
+out.append("")
 
 # Check 5: Recommendations
-print("5. Recommendations:")
-print("-" * 80)
+out.append("5. Recommendations:")
+out.append(_SEP)
 if not env_value and not env_file.exists():
-    print("   → Set the environment variable in your current terminal:")
-    print("     PowerShell: $env:PINECONE_API_KEY='your-key'")
-    print("     CMD:        set PINECONE_API_KEY=your-key")
-    print()
-    print("   → OR create a .env file in project root with:")
-    print("     PINECONE_API_KEY=your-key")
-elif env_file.exists() and "PINECONE_API_KEY" not in open(env_file).read():
-    print("   → Add PINECONE_API_KEY to your .env file:")
-    print("     PINECONE_API_KEY=your-key")
+    out.append("   → Set the environment variable in your current terminal:")
+    out.append("     PowerShell: $env:PINECONE_API_KEY='your-key'")
+    out.append("     CMD:        set PINECONE_API_KEY=your-key")
+    out.append("")
+    out.append("   → OR create a .env file in project root with:")
+    out.append("     PINECONE_API_KEY=your-key")
+elif env_file.exists() and not env_has_key:
+    out.append("   → Add PINECONE_API_KEY to your .env file:")
+    out.append("     PINECONE_API_KEY=your-key")
 elif env_value:
-    print("   → Environment variable is set!")
-    print("   → Make sure you restart your application after setting it")
-    print("   → Run: python -m module_a.check_vector_db")
+    out.append("   → Environment variable is set!")
+    out.append("   → Make sure you restart your application after setting it")
+    out.append("   → Run: python -m module_a.check_vector_db")
 else:
-    print("   → Check that the API key value is not empty")
-    print("   → Make sure there are no extra spaces or quotes")
+    out.append("   → Check that the API key value is not empty")
+    out.append("   → Make sure there are no extra spaces or quotes")
+
+out.append("")
+out.append(_BAR)
+out.append("Diagnostic Complete")
+out.append(_BAR)
 
-print()
-print("=" * 80)
-print("Diagnostic Complete")
-print("=" * 80)
+sys.stdout.write("\n".join(out) + "\n")
+sys.stdout.flush()
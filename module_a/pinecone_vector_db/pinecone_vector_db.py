@@ -3,11 +3,28 @@ Production-ready Pinecone Vector Database with critical fixes
 Fixes all showstopper bugs that would prevent usage
 """
 
+import asyncio
+import copy
+import hashlib
+import io
 import logging
+import os
+import threading
 import time
-import json
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import orjson
+from cachetools import TTLCache
+
+try:
+    import zstandard as zstd
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
 
 try:
     from pinecone import Pinecone, ServerlessSpec
@@ -23,9 +40,69 @@ from module_a.config import (
     EMBEDDING_DIMENSION,
 )
 from module_a.embeddings import EmbeddingGenerator
+from .text_arena import TextArena
 
 logger = logging.getLogger(__name__)
 
+# The text log is compacted once at least this many records have been appended
+# and more than this fraction of them are superseded or deleted entries
+TEXT_LOG_COMPACT_MIN_RECORDS = 1000
+TEXT_LOG_COMPACT_DEAD_RATIO = 0.5
+
+# Compression level for the compacted text snapshot (when zstandard is installed)
+TEXT_SNAPSHOT_ZSTD_LEVEL = 9
+
+# Vectors per upsert request, and maximum number of upsert batches in flight at once
+UPSERT_BATCH_SIZE = 100
+UPSERT_CONCURRENCY = 8
+
+# Decimal places kept for vector values sent to Pinecone. The rounding error
+# (at most 5e-8 per component) is negligible for cosine scores on normalized
+# embeddings, and it roughly halves the JSON request size versus full float reprs.
+UPSERT_VALUE_DECIMALS = 7
+
+# Number of unfiltered query results kept for repeated query embeddings, and
+# how long they are kept. Local upserts/deletes clear the cache; the TTL bounds
+# staleness after writes by other processes (ingest scripts, other workers).
+QUERY_CACHE_SIZE = 1024
+QUERY_CACHE_TTL_SECONDS = 60
+
+
+def _estimate_metadata_size(metadata: Dict[str, Any]) -> int:
+    """
+    Cheap upper bound on the JSON-encoded size of metadata in bytes
+    (a character never takes more than 6 bytes once UTF-8/JSON-escaped)
+    """
+    return 6 * sum(len(key) + len(str(value)) + 4 for key, value in metadata.items())
+
+
+# Metadata value types Pinecone accepts as-is
+_METADATA_SCALARS = (str, int, float, bool)
+_METADATA_SCALAR_TYPES = frozenset(_METADATA_SCALARS)
+
+
+def _clean_metadata_list(value: list) -> list:
+    """Convert list items to Pinecone-compatible types"""
+    return [
+        item if type(item) in _METADATA_SCALAR_TYPES or isinstance(item, _METADATA_SCALARS)
+        else str(item)
+        for item in value
+    ]
+
+
+# Metadata value handlers keyed by exact type (see _clean_metadata)
+_METADATA_HANDLERS = {
+    **{scalar_type: lambda value: value for scalar_type in _METADATA_SCALARS},
+    list: _clean_metadata_list,
+}
+
+
+def _batched(iterable: Iterable, size: int) -> Iterator[list]:
+    """Yield lists of up to size items from iterable without materializing it"""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
 # Set up file logging for Pinecone operations
 def _setup_pinecone_logging():
     """Ensure Pinecone logs are written to file"""
@@ -49,8 +126,11 @@ class PineconeLegalVectorDB:
         Initialize Pinecone with proper error handling
         
         Args:
-            text_storage: Optional external dict to store full text (avoids metadata limits)
+            text_storage: Optional external dict to store full text (avoids metadata limits);
+                defaults to a compact TextArena loaded from text_storage_file
             text_storage_file: Optional path to JSON file for persistent text storage
+                (new texts are appended to a JSONL log next to it and compacted
+                into a zstd-compressed snapshot)
         """
         if not PINECONE_AVAILABLE:
             raise ImportError(
@@ -75,6 +155,11 @@ class PineconeLegalVectorDB:
             logger.info("Connecting to Pinecone API...")
             self.pc = Pinecone(api_key=PINECONE_API_KEY)
             self.index_name = PINECONE_INDEX_NAME
+            self._index_host = None  # Resolved on first async use
+            
+            # Results of recent unfiltered queries, cleared whenever vectors change
+            self._query_cache = TTLCache(maxsize=QUERY_CACHE_SIZE, ttl=QUERY_CACHE_TTL_SECONDS)
+            self._query_cache_lock = threading.Lock()
             logger.info("✓ Pinecone client initialized")
             
             self.embedder = EmbeddingGenerator()
@@ -82,10 +167,18 @@ class PineconeLegalVectorDB:
             
             # Set up persistent text storage
             self.text_storage_file = Path(text_storage_file) if text_storage_file else PINECONE_TEXT_STORAGE_FILE
+            self.text_log_file = self.text_storage_file.with_suffix('.jsonl')
+            self.text_snapshot_file = self.text_storage_file.with_suffix('.jsonl.zst')
+            self._text_log_records = 0
+            self._text_log_damaged = False  # Corrupt records mid-log; blocks compaction
             if text_storage is not None:
                 self.text_storage = text_storage
             else:
                 self.text_storage = self._load_text_storage()
+                if self.text_storage and not self._has_text_log():
+                    # Loaded from the legacy JSON only: write it out as log /
+                    # snapshot now, so later appends never hide the JSON texts
+                    self._save_text_storage()
             
             # Check/create index
             self._initialize_index()
@@ -107,32 +200,181 @@ class PineconeLegalVectorDB:
                 "Check your API key and network connection."
             )
     
-    def _load_text_storage(self) -> Dict[str, str]:
-        """Load text storage from JSON file"""
-        if self.text_storage_file.exists():
+    def _has_text_log(self) -> bool:
+        """Whether the JSONL log or compressed snapshot has been written"""
+        return self.text_log_file.exists() or self.text_snapshot_file.exists()
+    
+    def _load_text_storage(self) -> TextArena:
+        """
+        Load text storage from the compressed snapshot (if any), then replay
+        the append-only JSONL log over it (last writer wins, null = deleted)
+        
+        The legacy JSON file is read only while neither exists. It is left
+        in place (it may be tracked in git) and ignored once migrated.
+        """
+        storage = TextArena()
+        if self.text_storage_file.exists() and not self._has_text_log():
             try:
-                with open(self.text_storage_file, 'r', encoding='utf-8') as f:
-                    storage = json.load(f)
-                logger.info(f"Loaded {len(storage)} texts from storage file")
-                return storage
+                with open(self.text_storage_file, 'rb') as f:
+                    storage.update(orjson.loads(f.read()))
             except Exception as e:
                 logger.warning(f"Failed to load text storage: {e}. Starting with empty storage.")
-                return {}
+                storage.clear()
+        
+        if self.text_snapshot_file.exists():
+            if not ZSTD_AVAILABLE:
+                # Compacting without the snapshot would drop its texts for good
+                raise ImportError(
+                    f"{self.text_snapshot_file} is zstd-compressed but zstandard is not installed. "
+                    "Install with: pip install zstandard"
+                )
+            try:
+                with open(self.text_snapshot_file, 'rb') as raw:
+                    with zstd.ZstdDecompressor().stream_reader(raw) as reader:
+                        self._replay_text_records(storage, io.BufferedReader(reader))
+            except Exception as e:
+                # Same reasoning: compacting a partial load would replace the
+                # snapshot and lose the unread texts for good
+                raise RuntimeError(
+                    f"Failed to load compressed text storage {self.text_snapshot_file}: {e}. "
+                    "Restore the file from a backup or remove it to start over."
+                ) from e
+        
+        if self.text_log_file.exists():
+            try:
+                with open(self.text_log_file, 'rb') as f:
+                    torn_at = self._replay_text_records(storage, f, strict=False)
+                if torn_at is not None:
+                    # An interrupted append; cut it off so the next append
+                    # does not continue the broken line
+                    logger.warning(f"Dropping torn last record of {self.text_log_file}")
+                    with open(self.text_log_file, 'r+b') as f:
+                        f.truncate(torn_at)
+            except OSError as e:
+                self._text_log_damaged = True
+                logger.error(f"Failed to replay text storage log: {e}")
+        
+        if storage:
+            logger.info(f"Loaded {len(storage)} texts from storage file")
         else:
             logger.info("Text storage file not found. Starting with empty storage.")
-            return {}
+        return storage
+    
+    def _replay_text_records(self, storage: TextArena, lines, strict: bool = True) -> Optional[int]:
+        """
+        Apply {chunk_id: text} JSON lines to storage (text None = deleted)
+        
+        strict raises on the first undecodable line. Otherwise such lines are
+        skipped one by one: a bad final line is a torn append and its byte
+        offset is returned, while a bad line followed by more data marks the
+        log as damaged (compaction would make the loss permanent).
+        """
+        offset = 0
+        bad_at = None
+        for line in lines:
+            start, offset = offset, offset + len(line)
+            if not line.strip():
+                continue
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                if strict:
+                    raise
+                if bad_at is not None:
+                    self._report_damaged_record(bad_at)
+                bad_at = start
+                continue
+            if bad_at is not None:
+                self._report_damaged_record(bad_at)
+                bad_at = None
+            for chunk_id, text in record.items():
+                if text is None:
+                    storage.pop(chunk_id, None)
+                else:
+                    storage[chunk_id] = text
+            self._text_log_records += 1
+        return bad_at
+    
+    def _report_damaged_record(self, offset: int) -> None:
+        self._text_log_damaged = True
+        logger.error(
+            f"Skipped corrupt record at byte {offset} of {self.text_log_file}; "
+            "compaction is disabled until the log is repaired"
+        )
+    
+    def _append_text_records(self, records: List[Dict[str, Optional[str]]]) -> None:
+        """Append {chunk_id: text} records (text None marks a deletion) to the JSONL log"""
+        if not records:
+            return
+        try:
+            self.text_log_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.text_log_file, 'ab', buffering=1 << 20) as f:
+                f.writelines(orjson.dumps(record) + b"\n" for record in records)
+            self._text_log_records += len(records)
+            logger.debug(f"Appended {len(records)} records to text storage log")
+        except Exception as e:
+            logger.warning(f"Failed to append to text storage log: {e}")
     
     def _save_text_storage(self) -> None:
-        """Save text storage to JSON file"""
+        """
+        Write the in-memory storage out in full (atomic replace)
+        
+        With zstandard installed this writes the compressed snapshot and empties
+        the JSONL log; otherwise the log itself is rewritten.
+        """
         try:
             # Ensure parent directory exists
-            self.text_storage_file.parent.mkdir(parents=True, exist_ok=True)
+            self.text_log_file.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(self.text_storage_file, 'w', encoding='utf-8') as f:
-                json.dump(self.text_storage, f, ensure_ascii=False, indent=2)
+            records = (
+                orjson.dumps({chunk_id: text}) + b"\n"
+                for chunk_id, text in self.text_storage.items()
+            )
+            if ZSTD_AVAILABLE:
+                tmp_file = self.text_snapshot_file.with_suffix('.zst.tmp')
+                with open(tmp_file, 'wb') as raw:
+                    compressor = zstd.ZstdCompressor(level=TEXT_SNAPSHOT_ZSTD_LEVEL)
+                    with compressor.stream_writer(raw, closefd=False) as writer:
+                        for record in records:
+                            writer.write(record)
+                os.replace(tmp_file, self.text_snapshot_file)
+                # The snapshot holds everything; replaying the old log over it
+                # would be harmless, so truncating after the replace is safe
+                open(self.text_log_file, 'wb').close()
+            else:
+                tmp_file = self.text_log_file.with_suffix('.jsonl.tmp')
+                with open(tmp_file, 'wb', buffering=1 << 20) as f:
+                    f.writelines(records)
+                os.replace(tmp_file, self.text_log_file)
+            self._text_log_records = len(self.text_storage)
             logger.debug(f"Saved {len(self.text_storage)} texts to storage file")
         except Exception as e:
             logger.warning(f"Failed to save text storage: {e}")
+    
+    def compact(self, force: bool = False) -> bool:
+        """
+        Rewrite the text log without superseded/deleted records
+        
+        Args:
+            force: Compact even if the dead-record ratio is below the threshold
+            
+        Returns:
+            True if the log was rewritten
+        """
+        if self._text_log_damaged:
+            logger.warning("Not compacting text storage: the log has corrupt records")
+            return False
+        
+        records = self._text_log_records
+        dead_ratio = 1 - len(self.text_storage) / records if records else 0.0
+        if not force and (
+            records < TEXT_LOG_COMPACT_MIN_RECORDS or dead_ratio <= TEXT_LOG_COMPACT_DEAD_RATIO
+        ):
+            return False
+        
+        logger.info(f"Compacting text storage log ({records} records, {dead_ratio:.0%} dead)")
+        self._save_text_storage()
+        return True
 
     def _initialize_index(self):
         """Create index if it doesn't exist, with proper waiting"""
@@ -154,36 +396,29 @@ class PineconeLegalVectorDB:
                     )
                 )
                 
-                # CRITICAL: Wait for index to be ready with timeout
+                # CRITICAL: Wait for index to be ready with timeout. Poll with
+                # exponential backoff so a quickly-ready index is seen quickly.
                 logger.info("Waiting for index to be ready...")
                 max_wait = 120  # 2 minutes max
-                waited = 0
+                waited = 0.0
+                delay = 1.0
+                index_ready = None  # Chosen from the first describe_index response
                 
                 while waited < max_wait:
                     try:
                         desc = self.pc.describe_index(self.index_name)
-                        # Check if ready (API may return dict or object)
-                        if isinstance(desc, dict):
-                            # New API format
-                            ready = desc.get('status', {}).get('ready', False) if isinstance(desc.get('status'), dict) else False
-                        else:
-                            # Object format
-                            status = getattr(desc, 'status', None)
-                            if status:
-                                ready = getattr(status, 'ready', False) if hasattr(status, 'ready') else False
-                            else:
-                                ready = False
-                        
-                        if ready:
-                            logger.info(f"Index ready after {waited}s")
+                        if index_ready is None:
+                            index_ready = self._ready_reader(desc)
+                        if index_ready(desc):
+                            logger.info(f"Index ready after {waited:.0f}s")
                             break
                     except Exception as e:
                         logger.debug(f"Waiting for index... ({e})")
                     
-                    time.sleep(5)
-                    waited += 5
-                
-                if waited >= max_wait:
+                    time.sleep(delay)
+                    waited += delay
+                    delay = min(delay * 1.5, 10.0)
+                else:
                     raise TimeoutError(
                         f"Index creation timed out after {max_wait}s. "
                         "Check Pinecone console: https://app.pinecone.io/"
@@ -199,6 +434,19 @@ class PineconeLegalVectorDB:
         else:
             logger.info(f"Using existing Pinecone index: {self.index_name}")
 
+    @staticmethod
+    def _ready_reader(desc) -> Callable[[Any], bool]:
+        """
+        Pick how to read the ready flag from describe_index output
+        
+        The API returns either plain dicts or model objects; the shape is
+        detected once from the first response and the returned function is
+        reused for every later poll.
+        """
+        if isinstance(desc, dict):
+            return lambda d: bool((d.get('status') or {}).get('ready', False))
+        return lambda d: bool(getattr(getattr(d, 'status', None), 'ready', False))
+
     def _verify_connection(self):
         """Verify we can connect to and query the index"""
         try:
@@ -215,17 +463,16 @@ class PineconeLegalVectorDB:
                 "Index may not be ready yet. Wait a few minutes and retry."
             )
 
-    def add_chunks(
+    def _validate_chunks(
         self,
         chunks: List[Dict[str, Any]],
         embeddings: List[List[float]]
-    ) -> None:
+    ) -> bool:
         """
-        Add chunks with embeddings to the database
+        Check chunks before anything is uploaded
         
-        Args:
-            chunks: List of chunk dicts with 'chunk_id', 'text', and 'metadata'
-            embeddings: List of embedding vectors
+        Returns:
+            False if there is nothing to add
         """
         if len(chunks) != len(embeddings):
             raise ValueError(
@@ -234,83 +481,216 @@ class PineconeLegalVectorDB:
 
         if not chunks:
             logger.warning("No chunks to add")
-            return
+            return False
+
+        if not all(chunk.get('chunk_id') for chunk in chunks):
+            raise ValueError("Each chunk must have a 'chunk_id' field")
+        return True
 
-        vectors_to_upsert = []
+    def _iter_vectors(
+        self,
+        chunks: List[Dict[str, Any]],
+        embeddings: List[List[float]],
+        text_records: List[Dict[str, str]]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily build Pinecone vectors, storing each chunk's full text and
+        recording it in text_records as it goes
+        """
+        # Hoist attribute lookups out of the per-chunk loop
+        storage = self.text_storage
+        clean_metadata = self._clean_metadata
+        append_record = text_records.append
         
         for chunk, embedding in zip(chunks, embeddings):
-            chunk_id = chunk.get('chunk_id')
-            if not chunk_id:
-                raise ValueError("Each chunk must have a 'chunk_id' field")
-            
+            chunk_id = chunk['chunk_id']
             text = chunk.get('text', '')
             metadata = chunk.get('metadata', {})
+            text_length = len(text)
             
             # CRITICAL FIX: Store full text externally to avoid 40KB metadata limit
             # Only store a preview in metadata
-            self.text_storage[chunk_id] = text  # Store full text
-            
-            # Save to persistent storage periodically (every 100 chunks)
-            if len(vectors_to_upsert) % 100 == 0:
-                self._save_text_storage()
+            storage[chunk_id] = text  # Store full text
+            append_record({chunk_id: text})
             
             # Prepare metadata with text preview
-            cleaned_metadata = self._clean_metadata(metadata)
-            cleaned_metadata['text_preview'] = text[:500] + ('...' if len(text) > 500 else '')
-            cleaned_metadata['text_length'] = len(text)
+            cleaned_metadata = clean_metadata(metadata)
+            cleaned_metadata['text_preview'] = text if text_length <= 500 else f"{text[:500]}..."
+            cleaned_metadata['text_length'] = text_length
             
-            # Validate metadata size (Pinecone limit: ~40KB)
-            metadata_size = len(json.dumps(cleaned_metadata))
-            if metadata_size > 35000:  # Leave some buffer
-                logger.warning(
-                    f"Chunk {chunk_id} metadata too large ({metadata_size} bytes), "
-                    "reducing preview..."
-                )
-                cleaned_metadata['text_preview'] = text[:200] + '...'
+            # Validate metadata size (Pinecone limit: ~40KB). Only serialize when
+            # the upper-bound estimate says the metadata could be too large
+            if _estimate_metadata_size(cleaned_metadata) > 35000:
+                metadata_size = len(orjson.dumps(cleaned_metadata))
+                if metadata_size > 35000:  # Leave some buffer
+                    logger.warning(
+                        f"Chunk {chunk_id} metadata too large ({metadata_size} bytes), "
+                        "reducing preview..."
+                    )
+                    cleaned_metadata['text_preview'] = f"{text[:200]}..."
             
-            vectors_to_upsert.append({
+            yield {
                 "id": chunk_id,
-                "values": embedding,
+                "values": np.round(np.asarray(embedding, dtype=np.float64), UPSERT_VALUE_DECIMALS).tolist(),
                 "metadata": cleaned_metadata,
-            })
+            }
+
+    def _raise_batch_errors(self, errors: Dict[int, Exception]) -> None:
+        """Report failed batches in batch order and raise the first failure"""
+        if errors:
+            for batch_num in sorted(errors):
+                logger.error(f"✗ Batch {batch_num} failed: {errors[batch_num]}")
+            raise errors[min(errors)]
+
+    def _record_upload(self, text_records: List[Dict[str, str]], stats: Optional[Dict[str, Any]] = None) -> None:
+        """Log the upload (with the vector count if stats were fetched) and persist the uploaded texts"""
+        self._invalidate_query_cache()
+        if stats is not None:
+            total_count = stats.get('total_vector_count', 0)
+            logger.info(f"✓ Upload complete. Total vectors in DB: {total_count}")
+        else:
+            logger.info(f"✓ Upload complete. {len(text_records)} chunks upserted")
+        
+        # Persist texts once all chunks are added (append-only, O(new chunks))
+        self._append_text_records(text_records)
+        self.compact()
+
+    def _upload_error(self, error: Exception) -> RuntimeError:
+        """Log an upload failure and build the error raised to callers"""
+        # Some batches may have landed; cached results could be stale
+        self._invalidate_query_cache()
+        logger.error(f"Failed to add chunks: {error}")
+        return RuntimeError(
+            f"Chunk upload failed: {error}. "
+            "This may be due to: (1) Network issues, (2) Malformed vectors, "
+            "(3) Quota limits. Check Pinecone console for details."
+        )
+
+    def add_chunks(
+        self,
+        chunks: List[Dict[str, Any]],
+        embeddings: List[List[float]],
+        verify: bool = False
+    ) -> None:
+        """
+        Add chunks with embeddings to the database
+        
+        Args:
+            chunks: List of chunk dicts with 'chunk_id', 'text', and 'metadata'
+            embeddings: List of embedding vectors
+            verify: Wait briefly for consistency and log the index vector count
+                (callers needing an exact count can also use get_count())
+        """
+        if not self._validate_chunks(chunks, embeddings):
+            return
 
         logger.info(f"Upserting {len(chunks)} chunks to Pinecone...")
         
-        # Upsert in batches with error handling
-        batch_size = 100
-        total_batches = (len(vectors_to_upsert) + batch_size - 1) // batch_size
+        # Upsert in batches with error handling. Batches are built lazily and sent
+        # concurrently, so their network round-trips overlap and at most
+        # UPSERT_CONCURRENCY batches of vectors are held in memory at once.
+        text_records = []
+        batches = _batched(self._iter_vectors(chunks, embeddings, text_records), UPSERT_BATCH_SIZE)
+        total_batches = -(-len(chunks) // UPSERT_BATCH_SIZE)
         
         try:
-            for i in range(0, len(vectors_to_upsert), batch_size):
-                batch = vectors_to_upsert[i:i+batch_size]
-                batch_num = i // batch_size + 1
-                
-                try:
-                    # Use namespace parameter only if needed (some Pinecone versions don't require it)
-                    self.index.upsert(vectors=batch)
-                    logger.info(f"✓ Batch {batch_num}/{total_batches} upserted")
-                except Exception as e:
-                    logger.error(f"✗ Batch {batch_num} failed: {e}")
-                    raise
+            errors = {}
             
-            # Wait for consistency
-            time.sleep(2)
+            def collect(done) -> None:
+                for future in done:
+                    batch_num = pending.pop(future)
+                    try:
+                        future.result()
+                        logger.info(f"✓ Batch {batch_num}/{total_batches} upserted")
+                    except Exception as e:
+                        errors[batch_num] = e
             
-            # Verify upload
-            stats = self.index.describe_index_stats()
-            total_count = stats.get('total_vector_count', 0)
-            logger.info(f"✓ Upload complete. Total vectors in DB: {total_count}")
+            pending = {}
+            with ThreadPoolExecutor(max_workers=min(UPSERT_CONCURRENCY, total_batches)) as executor:
+                for batch_num, batch in enumerate(batches, start=1):
+                    if len(pending) >= UPSERT_CONCURRENCY:
+                        collect(wait(pending, return_when=FIRST_COMPLETED).done)
+                    # Use namespace parameter only if needed (some Pinecone versions don't require it)
+                    pending[executor.submit(self.index.upsert, vectors=batch)] = batch_num
+                collect(wait(pending).done)
+            self._raise_batch_errors(errors)
             
-            # Save text storage after all chunks are added
-            self._save_text_storage()
+            stats = None
+            if verify:
+                # Wait for consistency, then verify upload
+                time.sleep(2)
+                stats = self.index.describe_index_stats()
+            self._record_upload(text_records, stats)
             
         except Exception as e:
-            logger.error(f"Failed to add chunks: {e}")
+            raise self._upload_error(e)
+
+    async def aadd_chunks(
+        self,
+        chunks: List[Dict[str, Any]],
+        embeddings: List[List[float]],
+        verify: bool = False
+    ) -> None:
+        """
+        Async variant of add_chunks: batches are upserted concurrently on the
+        event loop through Pinecone's asyncio client
+        """
+        if not self._validate_chunks(chunks, embeddings):
+            return
+
+        logger.info(f"Upserting {len(chunks)} chunks to Pinecone (async)...")
+        text_records = []
+        batches = enumerate(
+            _batched(self._iter_vectors(chunks, embeddings, text_records), UPSERT_BATCH_SIZE),
+            start=1,
+        )
+        total_batches = -(-len(chunks) // UPSERT_BATCH_SIZE)
+        
+        try:
+            async with await self._async_index() as index:
+                errors = {}
+                
+                # A fixed set of workers pulls batches from the shared lazy
+                # iterator, bounding in-flight requests like the threaded path
+                async def worker() -> None:
+                    for batch_num, batch in batches:
+                        try:
+                            await index.upsert(vectors=batch)
+                            logger.info(f"✓ Batch {batch_num}/{total_batches} upserted")
+                        except Exception as e:
+                            errors[batch_num] = e
+                
+                await asyncio.gather(*(
+                    worker() for _ in range(min(UPSERT_CONCURRENCY, total_batches))
+                ))
+                self._raise_batch_errors(errors)
+                
+                stats = None
+                if verify:
+                    # Wait for consistency, then verify upload
+                    await asyncio.sleep(2)
+                    stats = await index.describe_index_stats()
+                self._record_upload(text_records, stats)
+                
+        except Exception as e:
+            raise self._upload_error(e)
+
+    async def _async_index(self):
+        """
+        Open an asyncio Pinecone index handle (use with ``async with``)
+        
+        Requires the pinecone SDK v6+, which provides IndexAsyncio.
+        """
+        if not hasattr(self.pc, "IndexAsyncio"):
             raise RuntimeError(
-                f"Chunk upload failed: {e}. "
-                "This may be due to: (1) Network issues, (2) Malformed vectors, "
-                "(3) Quota limits. Check Pinecone console for details."
+                "Installed pinecone SDK has no asyncio support. "
+                "Upgrade with: pip install -U 'pinecone[asyncio]'"
             )
+        if self._index_host is None:
+            # describe_index is a blocking HTTP call; keep it off the event loop
+            desc = await asyncio.to_thread(self.pc.describe_index, self.index_name)
+            self._index_host = desc["host"] if isinstance(desc, dict) else desc.host
+        return self.pc.IndexAsyncio(host=self._index_host)
 
     def _clean_metadata(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -325,20 +705,86 @@ class PineconeLegalVectorDB:
             # Pinecone metadata keys can't contain dots
             safe_key = key.replace('.', '_')
             
-            if isinstance(value, (str, int, float, bool)):
+            # Exact-type table lookup first; subclasses fall back to isinstance
+            handler = _METADATA_HANDLERS.get(type(value))
+            if handler is not None:
+                cleaned[safe_key] = handler(value)
+            elif isinstance(value, _METADATA_SCALARS):
                 cleaned[safe_key] = value
             elif isinstance(value, list):
-                # Convert list items to compatible types
-                cleaned[safe_key] = [
-                    str(item) if not isinstance(item, (str, int, float, bool)) 
-                    else item 
-                    for item in value
-                ]
+                cleaned[safe_key] = _clean_metadata_list(value)
             else:
                 cleaned[safe_key] = str(value)
                 
         return cleaned
 
+    def _build_query_params(
+        self,
+        query_embedding: List[float],
+        n_results: int,
+        where: Optional[Dict],
+    ) -> Dict[str, Any]:
+        """Build keyword arguments for an index query"""
+        query_params = {
+            "vector": query_embedding,
+            "top_k": n_results,
+            "include_metadata": True
+        }
+        if where:
+            query_params["filter"] = where
+        return query_params
+
+    def _format_query_results(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a Pinecone query response to the ChromaDB-style result dict"""
+        matches = results.get("matches", [])
+        
+        if not matches:
+            logger.warning("No matches found")
+            return {
+                "ids": [[]],
+                "documents": [[]],
+                "metadatas": [[]],
+                "distances": [[]]  # Actually similarity scores!
+            }
+        
+        ids, documents, metadatas, scores = [], [], [], []
+        text_storage = self.text_storage
+        for match in matches:
+            chunk_id = match["id"]
+            # The response is discarded after formatting, so its metadata dict is
+            # reused in place rather than copied without the internal fields
+            metadata = match["metadata"]
+            text_preview = metadata.pop("text_preview", "")
+            metadata.pop("text_length", None)
+            
+            ids.append(chunk_id)
+            # CRITICAL FIX: Retrieve full text from storage, not metadata
+            documents.append(text_storage.get(chunk_id, text_preview))
+            metadatas.append(metadata)
+            scores.append(match["score"])
+        
+        formatted_results = {
+            "ids": [ids],
+            "documents": [documents],
+            "metadatas": [metadatas],
+            # CRITICAL: These are SIMILARITY SCORES (0-1, higher=better), not distances!
+            "distances": [scores],
+        }
+
+        logger.info(
+            f"✅ PINECONE QUERY SUCCESS - Retrieved {len(matches)} results, "
+            f"Top score: {matches[0]['score']:.3f}"
+        )
+        return formatted_results
+
+    def _query_error(self, error: Exception) -> RuntimeError:
+        """Log a query failure and build the error raised to callers"""
+        logger.error(f"Query failed: {error}")
+        return RuntimeError(
+            f"Pinecone query failed: {error}. "
+            "Check your network connection and Pinecone console."
+        )
+
     def query_with_embedding(
         self,
         query_embedding: List[float],
@@ -356,59 +802,76 @@ class PineconeLegalVectorDB:
         Returns:
             Dict with 'ids', 'documents', 'metadatas', 'distances' (actually scores!)
         """
+        # Filtered queries are not cached (filters are arbitrary nested dicts)
+        cache_key = None if where else self._query_cache_key(query_embedding, n_results)
+        if cache_key is not None:
+            with self._query_cache_lock:
+                cached = self._query_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"🔍 PINECONE QUERY CACHE HIT - Top K: {n_results}")
+                # Callers may modify the result, so never hand out the cached dict
+                return copy.deepcopy(cached)
+
         logger.info(f"🔍 QUERYING PINECONE - Index: {self.index_name}, Top K: {n_results}")
 
         try:
-            # Build query parameters
-            query_params = {
-                "vector": query_embedding,
-                "top_k": n_results,
-                "include_metadata": True
-            }
-            if where:
-                query_params["filter"] = where
-            
-            results = self.index.query(**query_params)
+            results = self.index.query(**self._build_query_params(query_embedding, n_results, where))
+            formatted_results = self._format_query_results(results)
+        except Exception as e:
+            raise self._query_error(e)
 
-            matches = results.get("matches", [])
-            
-            if not matches:
-                logger.warning("No matches found")
-                return {
-                    "ids": [[]],
-                    "documents": [[]],
-                    "metadatas": [[]],
-                    "distances": [[]]  # Actually similarity scores!
-                }
-            
-            # CRITICAL FIX: Retrieve full text from storage, not metadata
-            formatted_results = {
-                "ids": [[match["id"] for match in matches]],
-                "documents": [[
-                    self.text_storage.get(match["id"], match["metadata"].get("text_preview", ""))
-                    for match in matches
-                ]],
-                "metadatas": [[
-                    {k: v for k, v in match["metadata"].items() 
-                     if k not in ('text_preview', 'text_length')}
-                    for match in matches
-                ]],
-                # CRITICAL: These are SIMILARITY SCORES (0-1, higher=better), not distances!
-                "distances": [[match["score"] for match in matches]],
-            }
+        if cache_key is not None:
+            with self._query_cache_lock:
+                self._query_cache[cache_key] = copy.deepcopy(formatted_results)
+        return formatted_results
 
-            logger.info(
-                f"✅ PINECONE QUERY SUCCESS - Retrieved {len(matches)} results, "
-                f"Top score: {matches[0]['score']:.3f}"
-            )
-            return formatted_results
-            
+    @staticmethod
+    def _query_cache_key(query_embedding: List[float], n_results: int) -> Tuple[bytes, int]:
+        """Key a query by a digest of its float16-rounded embedding and top_k"""
+        digest = hashlib.sha1(np.asarray(query_embedding, dtype=np.float16).tobytes()).digest()
+        return digest, n_results
+
+    def _invalidate_query_cache(self) -> None:
+        """Drop cached query results after the index contents change"""
+        with self._query_cache_lock:
+            self._query_cache.clear()
+
+    async def aquery_with_embedding(
+        self,
+        query_embedding: List[float],
+        n_results: int = DEFAULT_RETRIEVAL_K,
+        where: Optional[Dict] = None,
+    ) -> Dict[str, Any]:
+        """Async variant of query_with_embedding"""
+        results = await self.aquery_many([query_embedding], n_results=n_results, where=where)
+        return results[0]
+
+    async def aquery_many(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = DEFAULT_RETRIEVAL_K,
+        where: Optional[Dict] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Run several queries concurrently over one asyncio index connection
+        
+        Returns:
+            One result dict (see query_with_embedding) per query, in input order
+        """
+        logger.info(
+            f"🔍 QUERYING PINECONE (async) - Index: {self.index_name}, "
+            f"Queries: {len(query_embeddings)}, Top K: {n_results}"
+        )
+
+        try:
+            async with await self._async_index() as index:
+                responses = await asyncio.gather(*(
+                    index.query(**self._build_query_params(embedding, n_results, where))
+                    for embedding in query_embeddings
+                ))
+            return [self._format_query_results(results) for results in responses]
         except Exception as e:
-            logger.error(f"Query failed: {e}")
-            raise RuntimeError(
-                f"Pinecone query failed: {e}. "
-                "Check your network connection and Pinecone console."
-            )
+            raise self._query_error(e)
 
     def get_count(self) -> int:
         """Get the number of vectors in the database"""
@@ -423,8 +886,9 @@ class PineconeLegalVectorDB:
         """Delete all vectors from the index (use with caution!)"""
         try:
             self.index.delete(delete_all=True)
+            self._invalidate_query_cache()
             self.text_storage.clear()
-            self._save_text_storage()
+            self.compact(force=True)
             logger.info("✓ Deleted all vectors from index")
         except Exception as e:
             logger.error(f"Failed to delete all: {e}")
@@ -434,9 +898,11 @@ class PineconeLegalVectorDB:
         """Delete specific vectors by ID"""
         try:
             self.index.delete(ids=ids)
+            self._invalidate_query_cache()
             for id in ids:
                 self.text_storage.pop(id, None)
-            self._save_text_storage()
+            self._append_text_records([{id: None} for id in ids])
+            self.compact()
             logger.info(f"✓ Deleted {len(ids)} vectors")
         except Exception as e:
             logger.error(f"Failed to delete vectors: {e}")
@@ -0,0 +1,84 @@
+"""
+Compact in-memory store for chunk texts
+Keeps all texts UTF-8 encoded in one buffer instead of one str object per chunk
+"""
+
+from array import array
+from collections.abc import MutableMapping
+from typing import Dict, Iterator
+
+
+class TextArena(MutableMapping):
+    """
+    Dict-like chunk_id -> text mapping backed by a single bytearray
+
+    Texts are appended to the buffer and addressed through parallel offset /
+    length arrays, so each entry costs two machine words plus its UTF-8 bytes
+    rather than a full Python str object. Overwritten and deleted texts leave
+    dead bytes behind; the buffer is compacted once they outweigh live data.
+    """
+
+    def __init__(self, texts: Dict[str, str] = None):
+        self._buf = bytearray()
+        self._offsets = array('q')
+        self._lengths = array('q')
+        self._rows: Dict[str, int] = {}
+        self._dead_bytes = 0
+        if texts:
+            self.update(texts)
+
+    def __getitem__(self, chunk_id: str) -> str:
+        row = self._rows[chunk_id]
+        offset = self._offsets[row]
+        return self._buf[offset:offset + self._lengths[row]].decode('utf-8')
+
+    def __setitem__(self, chunk_id: str, text: str) -> None:
+        encoded = text.encode('utf-8')
+        old_row = self._rows.get(chunk_id)
+        if old_row is not None:
+            self._dead_bytes += self._lengths[old_row]
+        self._rows[chunk_id] = len(self._offsets)
+        self._offsets.append(len(self._buf))
+        self._lengths.append(len(encoded))
+        self._buf += encoded
+        self._maybe_compact()
+
+    def __delitem__(self, chunk_id: str) -> None:
+        row = self._rows.pop(chunk_id)
+        self._dead_bytes += self._lengths[row]
+        self._maybe_compact()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, chunk_id) -> bool:
+        return chunk_id in self._rows
+
+    def clear(self) -> None:
+        self.__init__()
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the text buffer in bytes (live and dead)"""
+        return len(self._buf)
+
+    def _maybe_compact(self) -> None:
+        """Rebuild the buffer without dead bytes once they exceed the live bytes"""
+        if self._dead_bytes <= len(self._buf) - self._dead_bytes:
+            return
+
+        buf = bytearray()
+        offsets = array('q')
+        lengths = array('q')
+        for chunk_id, row in self._rows.items():
+            offset, length = self._offsets[row], self._lengths[row]
+            self._rows[chunk_id] = len(offsets)
+            offsets.append(len(buf))
+            lengths.append(length)
+            buf += self._buf[offset:offset + length]
+
+        self._buf, self._offsets, self._lengths = buf, offsets, lengths
+        self._dead_bytes = 0
@@ -3,12 +3,57 @@ Script to view Pinecone logs from the log file
 Shows recent Pinecone activity and operations
 """
 
+import os
+import re
 import sys
+from collections import deque
 from pathlib import Path
 from datetime import datetime
 
 from module_a.config import LOG_FILE
 
+# Keywords marking Pinecone-related log lines, matched in one pass per line
+PINECONE_KEYWORDS = (
+    'pinecone', 'Pinecone', 'PINECONE',
+    'vector_db', 'Vector DB', 'vector database',
+    'index', 'Index', 'query', 'Query',
+    'upsert', 'Upsert', 'retrieve', 'Retrieve'
+)
+_PINECONE_KEYWORDS_RE = re.compile('|'.join(map(re.escape, PINECONE_KEYWORDS)))
+_PINECONE_OPERATION_RE = re.compile('pinecone|vector_db|index', re.IGNORECASE)
+
+TAIL_BLOCK_SIZE = 64 * 1024
+
+
+def _tail_lines(path: Path, n: int) -> list:
+    """
+    Return the last n lines of a file (without line endings)
+    
+    Reads fixed-size blocks backwards from the end until enough newlines have
+    been seen, so only the tail of a large log is read and decoded.
+    """
+    if n <= 0:
+        return []
+    
+    blocks = []
+    newlines = 0
+    with open(path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        # One extra newline is needed to know the first kept line is complete
+        while pos > 0 and newlines <= n:
+            read = min(TAIL_BLOCK_SIZE, pos)
+            pos -= read
+            f.seek(pos)
+            block = f.read(read)
+            blocks.append(block)
+            newlines += block.count(b'\n')
+    
+    text = b''.join(reversed(blocks)).decode('utf-8', errors='replace')
+    lines = text.split('\n')
+    if lines[-1] == '':
+        lines.pop()  # Trailing newline at end of file
+    return [line.rstrip('\r') for line in lines[-n:]]
+
 
 def view_logs(lines: int = 50, filter_pinecone: bool = True):
     """
@@ -33,25 +78,13 @@ def view_logs(lines: int = 50, filter_pinecone: bool = True):
     print()
     
     try:
-        with open(LOG_FILE, 'r', encoding='utf-8') as f:
-            all_lines = f.readlines()
-        
-        # Get last N lines
-        recent_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
+        # Read only the last N lines from the end of the file
+        recent_lines = _tail_lines(LOG_FILE, lines)
         
         if filter_pinecone:
             # Filter for Pinecone-related logs
-            pinecone_keywords = [
-                'pinecone', 'Pinecone', 'PINECONE',
-                'vector_db', 'Vector DB', 'vector database',
-                'index', 'Index', 'query', 'Query',
-                'upsert', 'Upsert', 'retrieve', 'Retrieve'
-            ]
-            
-            filtered_lines = []
-            for line in recent_lines:
-                if any(keyword in line for keyword in pinecone_keywords):
-                    filtered_lines.append(line)
+            search = _PINECONE_KEYWORDS_RE.search
+            filtered_lines = [line for line in recent_lines if search(line)]
             
             if filtered_lines:
                 print(f"Showing {len(filtered_lines)} Pinecone-related log entries:\n")
@@ -88,13 +121,20 @@ def show_pinecone_status():
         return
     
     try:
+        # Count Pinecone operations in a single streaming pass, keeping only
+        # the last few Pinecone-related lines
+        init_count = query_count = error_count = 0
+        pinecone_lines = deque(maxlen=10)
         with open(LOG_FILE, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        # Count Pinecone operations
-        init_count = sum(1 for line in lines if 'Initializing Pinecone' in line or 'Using Pinecone' in line)
-        query_count = sum(1 for line in lines if 'Querying Pinecone' in line or 'Retrieved' in line)
-        error_count = sum(1 for line in lines if 'ERROR' in line and 'pinecone' in line.lower())
+            for line in f:
+                if 'Initializing Pinecone' in line or 'Using Pinecone' in line:
+                    init_count += 1
+                if 'Querying Pinecone' in line or 'Retrieved' in line:
+                    query_count += 1
+                if _PINECONE_OPERATION_RE.search(line):
+                    pinecone_lines.append(line)
+                    if 'ERROR' in line and 'pinecone' in line.lower():
+                        error_count += 1
         
         print("=" * 80)
         print("Pinecone Activity Summary")
@@ -106,8 +146,7 @@ def show_pinecone_status():
         # Show last few Pinecone operations
         print("\nRecent Pinecone Operations:")
         print("-" * 80)
-        pinecone_lines = [line for line in lines if any(kw in line.lower() for kw in ['pinecone', 'vector_db', 'index'])]
-        for line in pinecone_lines[-10:]:
+        for line in pinecone_lines:
             print(line.rstrip())
         
     except Exception as e:
@@ -39,6 +39,12 @@ INSTRUCTIONS:
 Based on the laws provided above, explain the answer to the user's query using the required structure (Summary, Key Legal Point, Explanation, Next Steps).
 """
 
+# The template split once at import around its two fields, so formatting a
+# prompt is a single join instead of re-parsing the template on every call
+_RAG_PROMPT_HEAD, _, _rest = LEGAL_RAG_PROMPT_TEMPLATE.partition("{context}")
+_RAG_PROMPT_MIDDLE, _, _RAG_PROMPT_TAIL = _rest.partition("{query}")
+del _rest
+
 def format_rag_prompt(query: str, context_chunks: list) -> str:
     """
     Format the RAG prompt with query and context
@@ -53,15 +59,13 @@ def format_rag_prompt(query: str, context_chunks: list) -> str:
     # Format context chunks
     formatted_context = []
     for i, chunk in enumerate(context_chunks, 1):
-        source = chunk['metadata'].get('source_file', 'Unknown Source')
-        section = chunk['metadata'].get('article_section', 'Unknown Section')
+        metadata = chunk['metadata']
+        source = metadata.get('source_file', 'Unknown Source')
+        section = metadata.get('article_section', 'Unknown Section')
         text = chunk['text']
         
         formatted_context.append(f"SOURCE {i}: {source} | SECTION: {section}\nCONTENT: {text}\n")
     
     context_str = "\n---\n".join(formatted_context)
     
-    return LEGAL_RAG_PROMPT_TEMPLATE.format(
-        context=context_str,
-        query=query
-    )
+    return "".join((_RAG_PROMPT_HEAD, context_str, _RAG_PROMPT_MIDDLE, query, _RAG_PROMPT_TAIL))
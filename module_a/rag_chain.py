@@ -4,6 +4,8 @@ Orchestrates retrieval and generation for legal explanations
 """
 
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 
 from .embeddings import EmbeddingGenerator
@@ -21,6 +23,12 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Article reference near the start of a chunk, used to label sources
+_ARTICLE_RE = re.compile(r'Article\s+(\d+[A-Za-z]?)')
+
+# Queries from run_many retrieved/generated at the same time
+RUN_MANY_CONCURRENCY = 8
+
 # Set up file logging
 def _setup_rag_logging():
     """Ensure RAG chain logs are written to file"""
@@ -114,10 +122,50 @@ class LegalRAGChain:
             Dictionary with 'query', 'explanation', and 'sources'
         """
         logger.info(f"Processing query: {query}")
+        query_embedding = self.embedder.generate_embedding(query)
+        return self._run_with_embedding(query, query_embedding, k)
+    
+    def run_many(
+        self,
+        queries: List[str],
+        k: int = DEFAULT_RETRIEVAL_K
+    ) -> List[Dict[str, Any]]:
+        """
+        Run the RAG pipeline for several queries at once
+        
+        All queries are embedded in a single batched forward pass (batches of
+        EMBEDDING_BATCH_SIZE; 32-64 suits most sentence encoders), then their
+        retrieval and generation run concurrently.
         
+        Args:
+            queries: User questions
+            k: Number of chunks to retrieve per query
+            
+        Returns:
+            One result dictionary (see run) per query, in input order
+        """
+        if not queries:
+            return []
+        
+        logger.info(f"Processing {len(queries)} queries")
+        query_embeddings = self.embedder.generate_embeddings_batch(queries, show_progress=False)
+        
+        with ThreadPoolExecutor(max_workers=min(RUN_MANY_CONCURRENCY, len(queries))) as executor:
+            return list(executor.map(
+                lambda query, query_embedding: self._run_with_embedding(query, query_embedding, k),
+                queries,
+                query_embeddings,
+            ))
+    
+    def _run_with_embedding(
+        self,
+        query: str,
+        query_embedding,
+        k: int
+    ) -> Dict[str, Any]:
+        """Retrieve and generate for a query whose embedding is already computed"""
         # Step 1: Retrieve relevant chunks
         logger.info("Step 1: Retrieving relevant laws...")
-        query_embedding = self.embedder.generate_embedding(query)
         retrieval_results = self.vector_db.query_with_embedding(
             query_embedding.tolist(), 
             n_results=k
@@ -162,10 +210,9 @@ class LegalRAGChain:
             article_section = chunk['metadata'].get('article_section')
 
             # If no specific section, try to extract from the text
-            if not article_section and 'Article' in chunk['text'][:200]:
+            if not article_section:
                 # Try to extract article number from beginning of text
-                import re
-                match = re.search(r'Article\s+(\d+[A-Za-z]?)', chunk['text'][:200])
+                match = _ARTICLE_RE.search(chunk['text'], 0, 200)
                 if match:
                     article_section = f"Article {match.group(1)}"
 
@@ -0,0 +1,75 @@
+"""
+Test section and cleaning patterns
+Checks that the re and RE2 engines classify Nepali markers the same way
+"""
+
+import re
+
+from .config import (
+    CLEANING_PATTERNS,
+    RE2_AVAILABLE,
+    SECTION_UNION_PATTERN,
+    _compile_pattern,
+    classify_match
+)
+
+# Markers that rely on Unicode digits / whitespace
+SECTION_SAMPLES = (
+    "धारा ५",
+    "धारा १२क",
+    "अनुच्छेद ३१",
+    "Article\u00a011",
+    "Section 8",
+    "11. Right to citizenship:",
+)
+
+CLEANING_SAMPLES = (
+    "पृष्ठ ५",
+    "Page 12",
+    "  ४२  ",
+)
+
+
+def _engines():
+    engines = [re]
+    if RE2_AVAILABLE:
+        import re2
+        engines.append(re2)
+    return engines
+
+
+def _classify(engine, text: str):
+    match = _compile_pattern(SECTION_UNION_PATTERN, "im", engine).search(text)
+    return classify_match(match) if match else None
+
+
+def test_section_classification() -> None:
+    """Every sample is found, and both engines agree on kind and number"""
+    for text in SECTION_SAMPLES:
+        results = {engine.__name__: _classify(engine, text) for engine in _engines()}
+        assert results["re"] is not None, f"{text!r} not matched by re"
+        assert len(set(results.values())) == 1, f"{text!r}: {results}"
+
+
+def test_cleaning_patterns() -> None:
+    """Page-number patterns match Devanagari numerals and NBSP under both engines"""
+    for engine in _engines():
+        pattern = _compile_pattern(
+            "|".join(f"(?:{p})" for p in CLEANING_PATTERNS['page_numbers']), "im", engine
+        )
+        for text in CLEANING_SAMPLES:
+            assert pattern.search(text), f"{text!r} not matched by {engine.__name__}"
+
+
+def main():
+    """Run the pattern checks"""
+    print(f"Engines: {', '.join(engine.__name__ for engine in _engines())}")
+    test_section_classification()
+    test_cleaning_patterns()
+    for text in SECTION_SAMPLES:
+        print(f"{text!r:32} -> {_classify(re, text)}")
+    print("All pattern checks passed.")
+
+
+if __name__ == "__main__":
+    main()
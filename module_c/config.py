@@ -17,6 +17,36 @@ DATA_DIR.mkdir(parents=True, exist_ok=True)
 MISTRAL_MODEL = "mistral-tiny"
 MISTRAL_API_KEY_ENV_VAR = "MISTRAL_API_KEY"
 
+# Number of letter requests packed into one batched Mistral prompt
+LETTER_BATCH_SIZE = 4
+
+# Maximum Mistral requests in flight from one agenerate_many call (rate limits)
+MISTRAL_MAX_CONCURRENCY = 10
+
+# Exact-match cache for deterministic (temperature 0.0) Mistral responses
+RESPONSE_CACHE_SIZE = 512
+
+# Semantic cache for template retrieval: a query whose embedding has cosine
+# similarity >= threshold with a recent query reuses that query's results
+SEMANTIC_CACHE_SIZE = 256
+SEMANTIC_CACHE_THRESHOLD = 0.95
+
+# Query embeddings persisted across restarts (shelve), with an in-memory LRU in front
+CACHE_DIR = DATA_DIR / "cache"
+EMBEDDING_CACHE_FILE = CACHE_DIR / "embed.db"
+EMBEDDING_CACHE_MEMORY_SIZE = 1024
+
+# Template vector store: "chroma" (default) or "usearch" (memory-mapped index)
+VECTOR_DB_BACKEND = os.getenv("VECTOR_DB_BACKEND", "chroma").lower()
+
+# Threads Chroma's HNSW index uses for queries and inserts (unset: Chroma's default).
+# Stored in the collection metadata, so it applies to newly created collections.
+CHROMA_HNSW_NUM_THREADS = int(os.getenv("CHROMA_HNSW_NUM_THREADS", "0")) or None
+
+# Template indexing: parallel file loading and embedding batch size
+INDEX_LOAD_WORKERS = 8
+INDEX_EMBEDDING_BATCH_SIZE = 64
+
 # Logging configuration
 LOG_LEVEL = "INFO"
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -3,13 +3,73 @@ Letter Generator Module
 Combines templates with user data to produce final letters.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+import re
+from functools import lru_cache
+import orjson
+from typing import Dict, Any, FrozenSet, Iterator, List, Optional, Set
+from .config import LETTER_BATCH_SIZE
 from .template_loader import TemplateLoader
 from .llm_client import MistralClient
 
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=64)
+def _substitution_pattern(keys: FrozenSet[str]) -> "re.Pattern":
+    """
+    One alternation matching [Key], {{Key}}, <Key> and {Key} for every key.
+    Longest literals first, so {{Key}} wins over the {Key} inside it.
+    """
+    literals = {
+        form.format(key=key)
+        for key in keys
+        for form in ("[{key}]", "{{{{{key}}}}}", "<{key}>", "{{{key}}}")
+    }
+    return re.compile("|".join(map(re.escape, sorted(literals, key=len, reverse=True))))
+
+
+# Placeholders left unfilled in a draft: [Key], {{Key}}, <Key> or {Key}
+_UNRESOLVED_PLACEHOLDER_RE = re.compile(r'\[[^\]\n]+\]|\{\{[^}\n]+\}\}|<[^>\n]+>|\{[^{}\n]+\}')
+
+# Drafts longer than this are always sent for refinement
+REFINE_SKIP_MAX_LENGTH = 4000
+
+
+ANALYZE_AND_GENERATE_SYSTEM_PROMPT = MistralClient.NEPAL_LEGAL_SYSTEM_PROMPT + """
+Respond with a single JSON object and nothing else, using exactly these keys:
+  "missing_fields": list of template placeholders that are MISSING or cannot be inferred from the user's details (empty list if none)
+  "letter": the final letter as a string
+"""
+
+
+def _parse_json(response: str, opening: str, closing: str, expected: type):
+    """
+    Parse the outermost JSON value delimited by opening/closing in an LLM
+    response, tolerating ```json fences or stray text around it.
+    Returns None if no value of the expected type can be decoded.
+    """
+    start = response.find(opening)
+    end = response.rfind(closing)
+    if start == -1 or end < start:
+        return None
+    try:
+        parsed = orjson.loads(response[start:end + 1])
+    except orjson.JSONDecodeError:
+        return None
+    return parsed if isinstance(parsed, expected) else None
+
+
+def _parse_json_object(response: str) -> Optional[Dict[str, Any]]:
+    """The JSON object in an LLM response, or None."""
+    return _parse_json(response, "{", "}", dict)
+
+
+def _parse_json_array(response: str) -> Optional[List[Any]]:
+    """The JSON array in an LLM response, or None."""
+    return _parse_json(response, "[", "]", list)
+
 class LetterGenerator:
     """
     Handles the generation of letters from templates and user data.
@@ -30,37 +90,52 @@ class LetterGenerator:
         """
         template_text = self.loader.load_template(template_name)
         
-        # 1. Simple Substitution
-        # We iterate through keys in user_data and replace corresponding placeholders
-        # We try to match [Key], {{Key}}, <Key>
-        
-        generated_text = template_text
+        if not user_data:
+            return template_text
         
+        # 1. Simple Substitution
+        # Placeholders for every key in user_data are replaced in a single pass
+        # over the template. We match [Key], {{Key}}, <Key> and {Key}.
+        values = {}
         for key, value in user_data.items():
-            # Replace [Key]
-            generated_text = generated_text.replace(f"[{key}]", str(value))
-            # Replace {{Key}}
-            generated_text = generated_text.replace(f"{{{{{key}}}}}", str(value))
-            # Replace <Key>
-            generated_text = generated_text.replace(f"<{key}>", str(value))
-            # Replace {Key}
-            generated_text = generated_text.replace(f"{{{key}}}", str(value))
-            
-        return generated_text
+            value = str(value)
+            values[f"[{key}]"] = value
+            values[f"{{{{{key}}}}}"] = value
+            values[f"<{key}>"] = value
+            values[f"{{{key}}}"] = value
+        
+        pattern = _substitution_pattern(frozenset(user_data))
+        return pattern.sub(lambda match: values[match.group(0)], template_text)
 
-    def refine_with_llm(self, draft_letter: str, instructions: str = "") -> str:
+    @staticmethod
+    def _needs_refinement(draft_letter: str, instructions: str = "") -> bool:
+        """
+        Whether a draft is worth an LLM pass: explicit instructions were given,
+        placeholders remain unfilled, or the letter is unusually long.
+        """
+        return bool(
+            instructions.strip()
+            or len(draft_letter) >= REFINE_SKIP_MAX_LENGTH
+            or _UNRESOLVED_PLACEHOLDER_RE.search(draft_letter)
+        )
+
+    def refine_with_llm(self, draft_letter: str, instructions: str = "", force: bool = False) -> str:
         """
         Use LLM to polish or refine the letter.
+        A fully filled, ordinary-length draft with no instructions is returned
+        as-is without an API call; pass force=True to refine it anyway.
         """
         if not self.llm:
             logger.warning("LLM not available for refinement.")
             return draft_letter
             
+        if not force and not self._needs_refinement(draft_letter, instructions):
+            logger.info("Draft has no unresolved placeholders; skipping LLM refinement.")
+            return draft_letter
+            
         prompt = f"""
-You are a helpful legal assistant for Nepal.
 Please refine the following letter to be more professional and grammatically correct.
 Ensure it remains factual to the original content.
-Do not add any fake information.
 
 Instructions: {instructions}
 
@@ -71,6 +146,69 @@ Refined Letter:
 """
         return self.llm.generate_response(prompt)
 
+    def _select_template(self, description: str, template_name: str = None):
+        """
+        Pick the template for a description: the named one if given,
+        otherwise the best RAG match.
+        Returns (template, None) or (None, error_result).
+        """
+        if template_name:
+            # Direct template usage
+            try:
+                content = self.loader.load_template(template_name)
+            except Exception as e:
+                return None, {"success": False, "error": f"Template '{template_name}' not found: {e}"}
+            logger.info(f"Using specified template: {template_name}")
+            return {"filename": template_name, "content": content, "score": 1.0}, None
+
+        # RAG Retrieval
+        from .retriever import get_retriever
+        retrieved_templates = get_retriever().retrieve_templates(description, k=1)
+        if not retrieved_templates:
+            return None, {"success": False, "error": "No relevant template found."}
+        return retrieved_templates[0], None
+
+    def _template_placeholders(self, template: Dict[str, Any]) -> Set[str]:
+        """
+        Placeholders of a selected template. Retrieved templates carry the
+        list the indexer stored in their metadata; otherwise the text is parsed.
+        """
+        stored = (template.get('metadata') or {}).get('placeholders')
+        if stored is None:
+            return self.loader.extract_placeholders(template['content'])
+        return {p for p in stored.split(', ') if p}
+
+    @staticmethod
+    def _format_additional_data(additional_data: Optional[Dict[str, str]]) -> str:
+        """Format additional user details as a prompt section."""
+        if not additional_data:
+            return ""
+        return "\nAdditional User Details:\n" + "\n".join(f"- {k}: {v}" for k, v in additional_data.items())
+
+    def _build_generation_prompt(self, description: str, additional_data: Optional[Dict[str, str]], best_template: Dict[str, Any]) -> str:
+        """Prompt asking the LLM to fill/adapt the selected template."""
+        template_content = best_template['content']
+        template_name = best_template['filename']
+        additional_info_str = self._format_additional_data(additional_data)
+        
+        return f"""
+Your task is to write a formal letter based on the user's description, using the provided template as a strict guide.
+
+User Description: "{description}"
+{additional_info_str}
+
+Selected Template ({template_name}):
+{template_content}
+
+Instructions:
+1. Use the structure and formal language of the Selected Template.
+2. Fill in the placeholders (like [Name], {{Date}}) with information from the User Description and Additional Details.
+3. If information is still missing, use a generic placeholder like "[Insert Name]".
+4. Output ONLY the final letter in Nepali (or English if the template is English). Do not add conversational text.
+
+Final Letter:
+"""
+
     def analyze_requirements(self, description: str) -> Dict[str, Any]:
         """
         Analyzes the user description against the best matching template
@@ -79,20 +217,18 @@ Refined Letter:
         if not self.llm:
             raise RuntimeError("LLM required for analysis.")
             
-        from .retriever import TemplateRetriever
+        from .retriever import get_retriever
         
-        retriever = TemplateRetriever()
+        retriever = get_retriever()
         retrieved_templates = retriever.retrieve_templates(description, k=1)
         
         if not retrieved_templates:
             return {"success": False, "error": "No relevant template found."}
             
         best_template = retrieved_templates[0]
-        template_content = best_template['content']
         template_name = best_template['filename']
         
-        # Extract placeholders from the template
-        placeholders = self.loader.extract_placeholders(template_content)
+        placeholders = self._template_placeholders(best_template)
         
         if not placeholders:
             return {
@@ -104,24 +240,26 @@ Refined Letter:
 
         # Ask LLM which fields are missing from the description
         prompt = f"""
-You are an intelligent assistant.
 I have a letter template with the following required placeholders: {list(placeholders)}
 
 The user provided this description: "{description}"
 
 Identify which placeholders are MISSING or cannot be inferred from the description.
-Return ONLY a comma-separated list of missing placeholders. If none are missing, return "None".
+Return ONLY a JSON array of the missing placeholder names, e.g. ["Name", "Date"]. If none are missing, return [].
 
 Missing Placeholders:
 """
         response = self.llm.generate_response(prompt, temperature=0.0)
         
-        missing_fields = []
-        if "None" not in response:
-            # Clean up response
+        parsed = _parse_json_array(response)
+        if parsed is not None:
+            missing_fields = [str(f).strip() for f in parsed if str(f).strip()]
+        elif "None" in response:
+            missing_fields = []
+        else:
+            # Model ignored the JSON format; fall back to a comma-separated list
             cleaned = response.replace("\n", "").strip()
-            if cleaned:
-                missing_fields = [f.strip() for f in cleaned.split(",") if f.strip()]
+            missing_fields = [f.strip() for f in cleaned.split(",") if f.strip()]
         
         return {
             "success": True,
@@ -139,69 +277,195 @@ Missing Placeholders:
         if not self.llm:
             raise RuntimeError("LLM required for smart generation.")
             
-        best_template = None
-        retrieval_score = 1.0 # Default if manual selection
+        best_template, error = self._select_template(description, template_name)
+        if error:
+            return error
+            
+        template_name = best_template['filename']
+        retrieval_score = best_template['score']
         
-        if template_name:
-            # Direct template usage
-            try:
-                content = self.loader.load_template(template_name)
-                best_template = {
-                    "filename": template_name,
-                    "content": content,
-                    "score": 1.0
-                }
-                logger.info(f"Using specified template: {template_name}")
-            except Exception as e:
-                return {"success": False, "error": f"Template '{template_name}' not found: {e}"}
-        else:
-            # RAG Retrieval
-            from .retriever import TemplateRetriever
-            retriever = TemplateRetriever()
-            retrieved_templates = retriever.retrieve_templates(description, k=1)
-            
-            if not retrieved_templates:
-                return {
-                    "success": False,
-                    "error": "No relevant template found."
-                }
-            best_template = retrieved_templates[0]
-            retrieval_score = best_template['score']
+        logger.info(f"Selected template: {template_name}")
+        
+        prompt = self._build_generation_prompt(description, additional_data, best_template)
+        generated_letter = self.llm.generate_response(prompt, temperature=0.3)
+        
+        return {
+            "success": True,
+            "letter": generated_letter,
+            "template_used": template_name,
+            "retrieval_score": retrieval_score
+        }
+
+    async def agenerate_from_description(self, description: str, additional_data: Dict[str, str] = None, template_name: str = None) -> Dict[str, Any]:
+        """
+        Async generate_from_description.
+        Template retrieval (embedding + vector search) runs in a worker thread
+        while the Mistral connection is opened, then the letter is generated
+        with the async client.
+        """
+        if not self.llm:
+            raise RuntimeError("LLM required for smart generation.")
+            
+        selection = asyncio.create_task(asyncio.to_thread(self._select_template, description, template_name))
+        await self.llm.awarm_connection()
+        best_template, error = await selection
+        if error:
+            return error
+            
+        template_name = best_template['filename']
+        logger.info(f"Selected template: {template_name}")
+        
+        prompt = self._build_generation_prompt(description, additional_data, best_template)
+        generated_letter = await self.llm.agenerate_response(prompt, temperature=0.3)
+        
+        return {
+            "success": True,
+            "letter": generated_letter,
+            "template_used": template_name,
+            "retrieval_score": best_template['score']
+        }
+
+    def generate_from_description_stream(self, description: str, additional_data: Dict[str, str] = None, template_name: str = None) -> Iterator[str]:
+        """
+        Streaming generate_from_description: yields the letter text as the LLM
+        produces it. Template selection happens before the first chunk and
+        raises ValueError if no template can be used.
+        """
+        if not self.llm:
+            raise RuntimeError("LLM required for smart generation.")
+            
+        best_template, error = self._select_template(description, template_name)
+        if error:
+            raise ValueError(error["error"])
+            
+        logger.info(f"Selected template: {best_template['filename']}")
+        
+        prompt = self._build_generation_prompt(description, additional_data, best_template)
+        return self.llm.stream_response(prompt, temperature=0.3)
+
+    def generate_from_descriptions(self, requests: List[Dict[str, Any]], batch_size: int = LETTER_BATCH_SIZE) -> List[Dict[str, Any]]:
+        """
+        Batched generate_from_description.
+        Each request is a dict with "description" and optional "additional_data"
+        and "template_name". Up to batch_size letters are produced per LLM call.
+        Results are returned in request order.
+        """
+        if not self.llm:
+            raise RuntimeError("LLM required for smart generation.")
+            
+        results, pending = self._prepare_generation_requests(requests)
+            
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            letters = self.llm.generate_responses_batch([prompt for _, _, prompt in batch], temperature=0.3)
+            self._store_generated_letters(results, batch, letters)
+        
+        return results
+
+    async def agenerate_from_descriptions(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Async generate_from_description for many requests.
+        One LLM call per letter, issued concurrently (bounded by the client).
+        Results are returned in request order.
+        """
+        if not self.llm:
+            raise RuntimeError("LLM required for smart generation.")
+            
+        results, pending = self._prepare_generation_requests(requests)
+        letters = await self.llm.agenerate_many([prompt for _, _, prompt in pending], temperature=0.3)
+        self._store_generated_letters(results, pending, letters)
+        return results
+
+    def _prepare_generation_requests(self, requests: List[Dict[str, Any]]):
+        """
+        Select templates and build prompts for a list of generation requests.
+        Returns (results, pending): results holds error dicts for requests that
+        failed template selection, pending is a list of (index, template, prompt).
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+        pending = []
+        for i, request in enumerate(requests):
+            description = request.get("description", "")
+            additional_data = request.get("additional_data")
+            best_template, error = self._select_template(description, request.get("template_name"))
+            if error:
+                results[i] = error
+                continue
+            prompt = self._build_generation_prompt(description, additional_data, best_template)
+            pending.append((i, best_template, prompt))
+        return results, pending
+
+    @staticmethod
+    def _store_generated_letters(results: List[Optional[Dict[str, Any]]], pending, letters: List[str]) -> None:
+        """Fill results with the letters generated for pending requests."""
+        for (i, best_template, _), letter in zip(pending, letters):
+            results[i] = {
+                "success": True,
+                "letter": letter,
+                "template_used": best_template['filename'],
+                "retrieval_score": best_template['score']
+            }
+
+    def analyze_and_generate(self, description: str, additional_data: Dict[str, str] = None, template_name: str = None) -> Dict[str, Any]:
+        """
+        Single-call alternative to analyze_requirements + generate_from_description.
+        One prompt asks the LLM for both the missing fields and the letter,
+        returned as JSON, so the pair costs one round-trip instead of two.
+        """
+        if not self.llm:
+            raise RuntimeError("LLM required for smart generation.")
+            
+        best_template, error = self._select_template(description, template_name)
+        if error:
+            return error
             
         template_content = best_template['content']
         template_name = best_template['filename']
+        placeholders = self._template_placeholders(best_template)
         
         logger.info(f"Selected template: {template_name}")
         
-        # Format additional data for the prompt
-        additional_info_str = ""
-        if additional_data:
-            additional_info_str = "\nAdditional User Details:\n" + "\n".join(f"- {k}: {v}" for k, v in additional_data.items())
+        additional_info_str = self._format_additional_data(additional_data)
         
-        # Prompt LLM to fill the retrieved template
         prompt = f"""
-You are a helpful legal assistant for Nepal.
-Your task is to write a formal letter based on the user's description, using the provided template as a strict guide.
+Your task is to write a formal letter based on the user's description, using the provided template as a strict guide,
+and to report which template placeholders the user has not provided.
 
 User Description: "{description}"
 {additional_info_str}
 
+Template Placeholders: {sorted(placeholders)}
+
 Selected Template ({template_name}):
 {template_content}
 
 Instructions:
 1. Use the structure and formal language of the Selected Template.
 2. Fill in the placeholders (like [Name], {{Date}}) with information from the User Description and Additional Details.
-3. If information is still missing, use a generic placeholder like "[Insert Name]".
-4. Output ONLY the final letter in Nepali (or English if the template is English). Do not add conversational text.
-
-Final Letter:
+3. If information is still missing, list the placeholder in "missing_fields" and use a generic placeholder like "[Insert Name]" in the letter.
+4. The letter must be in Nepali (or English if the template is English), with no conversational text.
 """
-        generated_letter = self.llm.generate_response(prompt, temperature=0.3)
+        # Deterministic output keeps the field analysis stable, as in analyze_requirements
+        response = self.llm.generate_response(
+            prompt,
+            system_prompt=ANALYZE_AND_GENERATE_SYSTEM_PROMPT,
+            temperature=0.0
+        )
+        
+        parsed = _parse_json_object(response)
+        if parsed is None:
+            logger.warning("LLM response was not valid JSON; returning it as the letter.")
+            parsed = {"letter": response, "missing_fields": []}
+            
+        missing_fields = parsed.get("missing_fields") or []
+        if isinstance(missing_fields, str):
+            missing_fields = [f.strip() for f in missing_fields.split(",") if f.strip()]
         
         return {
             "success": True,
-            "letter": generated_letter,
+            "letter": str(parsed.get("letter", "")),
             "template_used": template_name,
-            "retrieval_score": retrieval_score
+            "retrieval_score": best_template['score'],
+            "detected_placeholders": list(placeholders),
+            "missing_fields": [str(f) for f in missing_fields]
         }
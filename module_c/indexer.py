@@ -3,23 +3,73 @@ Indexer Module for Module C
 Ingests templates from the data directory into the Vector DB.
 """
 
+import hashlib
+import json
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Dict, Tuple
 
 # Add project root to path to allow importing module_a
 sys.path.append(str(Path(__file__).parent.parent))
 
-from module_c.config import TEMPLATE_DIR
+from module_c.config import TEMPLATE_DIR, INDEX_LOAD_WORKERS, INDEX_EMBEDDING_BATCH_SIZE
 from module_c.template_loader import TemplateLoader
-from module_c.vector_db import TemplateVectorDB
+from module_c.vector_db import create_template_db
 from module_a.embeddings import EmbeddingGenerator  # Reuse Module A's embedder
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def build_index():
+# sha256 of each indexed template's content (kept next to the DB, one file per
+# backend), so unchanged files are not re-embedded
+def _hashes_file(db) -> Path:
+    return db.persist_directory / db.HASHES_FILENAME
+
+def _load_hashes(db) -> Dict[str, str]:
+    """Hashes of the templates currently in the DB (empty if unknown or the DB is empty)."""
+    hashes_file = _hashes_file(db)
+    if not hashes_file.exists() or db.count() == 0:
+        return {}
+    try:
+        with open(hashes_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read {hashes_file}: {e}. Re-indexing all templates.")
+        return {}
+
+def _save_hashes(db, hashes: Dict[str, str]) -> None:
+    with open(_hashes_file(db), 'w', encoding='utf-8') as f:
+        json.dump(hashes, f, indent=2, sort_keys=True)
+
+def _load_one(loader: TemplateLoader, filename: str) -> Tuple[Dict[str, Any], str]:
+    """Load one template; returns (template_data, text_for_embedding)."""
+    content = loader.load_template(filename)
+    placeholders = list(loader.extract_placeholders(content))
+    
+    # Create a rich representation for embedding
+    # We include the filename as it often contains the intent (e.g. "CitizenshipApplication")
+    # and the content itself.
+    text_for_embedding = f"Template Name: {filename}\nContent:\n{content}"
+    
+    template_data = {
+        "id": filename,
+        "text": content,
+        "metadata": {
+            "filename": filename,
+            "placeholders": ", ".join(placeholders)
+        }
+    }
+    logger.info(f"Loaded: {filename}")
+    return template_data, text_for_embedding
+
+def build_index(fast_ingest: bool = False):
+    """
+    Index all templates. fast_ingest trades crash safety for write speed
+    (see TemplateVectorDB); run it only when nothing else uses the DB.
+    """
     logger.info("Starting Template Indexing...")
     
     # 1. Load Templates
@@ -30,52 +80,48 @@ def build_index():
         logger.warning("No templates found to index.")
         return
 
-    templates_data = []
-    texts = []
-    
-    for filename in template_files:
-        content = loader.load_template(filename)
-        placeholders = list(loader.extract_placeholders(content))
-        
-        # Create a rich representation for embedding
-        # We include the filename as it often contains the intent (e.g. "CitizenshipApplication")
-        # and the content itself.
-        text_for_embedding = f"Template Name: {filename}\nContent:\n{content}"
-        
-        templates_data.append({
-            "id": filename,
-            "text": content,
-            "metadata": {
-                "filename": filename,
-                "placeholders": ", ".join(placeholders)
-            }
-        })
-        texts.append(text_for_embedding)
-        logger.info(f"Loaded: {filename}")
+    # File reads overlap on I/O; results keep template_files order
+    with ThreadPoolExecutor(max_workers=INDEX_LOAD_WORKERS) as executor:
+        loaded = list(executor.map(lambda filename: _load_one(loader, filename), template_files))
+    templates_data = [template_data for template_data, _ in loaded]
+    texts = [text for _, text in loaded]
 
-    # 2. Generate Embeddings
-    logger.info("Generating embeddings...")
-    embedder = EmbeddingGenerator()
-    embeddings = embedder.generate_embeddings_batch(texts)
+    # 2. Find templates added, changed or removed since the last run
+    db = create_template_db(fast_ingest=fast_ingest)
+    if not db.has_expected_space():
+        # The distance function cannot be changed in place
+        logger.info("Recreating collection with cosine distance...")
+        db.reset()
+    stored_hashes = _load_hashes(db)
+    hashes = {
+        template_data["id"]: hashlib.sha256(template_data["text"].encode('utf-8')).hexdigest()
+        for template_data in templates_data
+    }
+    changed = [i for i, template_data in enumerate(templates_data)
+               if stored_hashes.get(template_data["id"]) != hashes[template_data["id"]]]
+    removed = [filename for filename in stored_hashes if filename not in hashes]
     
-    # 3. Store in Vector DB
-    logger.info("Storing in Vector DB...")
-    db = TemplateVectorDB()
+    if removed:
+        logger.info(f"Removing {len(removed)} deleted templates from Vector DB...")
+        db.delete_templates(removed)
     
-    # Optional: Reset collection to avoid duplicates on re-run
-    # In a real app, we might check existence, but for hackathon, simple overwrite/add is fine.
-    # Chroma's `add` will error on duplicate IDs, so let's use `upsert` if available or just `add`.
-    # Since we use filename as ID, `add` might fail if already exists.
-    # Let's try to delete and recreate for a clean slate or just catch error.
-    try:
-        db.client.delete_collection(db.collection_name)
-        db.collection = db.client.create_collection(db.collection_name)
-    except Exception:
-        pass # Collection might not exist
-
-    db.add_templates(templates_data, embeddings.tolist())
+    if not changed:
+        logger.info("All templates unchanged; nothing to embed.")
+    else:
+        # 3. Generate Embeddings (changed templates only)
+        logger.info(f"Generating embeddings for {len(changed)} of {len(templates_data)} templates...")
+        embedder = EmbeddingGenerator()
+        embeddings = embedder.generate_embeddings_batch(
+            [texts[i] for i in changed], batch_size=INDEX_EMBEDDING_BATCH_SIZE, normalize=True
+        )
+        
+        # 4. Store in Vector DB
+        logger.info("Storing in Vector DB...")
+        db.upsert_templates([templates_data[i] for i in changed], embeddings.tolist())
+    
+    _save_hashes(db, hashes)
     
     logger.info("Indexing Complete!")
 
 if __name__ == "__main__":
-    build_index()
+    build_index(fast_ingest="--fast-ingest" in sys.argv)
@@ -3,7 +3,7 @@ Public Interface for Module C (Letter Generation)
 """
 
 import logging
-from typing import List, Dict, Any
+from typing import Iterator, List, Dict, Any
 from .generator import LetterGenerator
 
 logger = logging.getLogger(__name__)
@@ -56,8 +56,8 @@ class LetterGenerationAPI:
         """
         try:
             # Lazy import
-            from .retriever import TemplateRetriever
-            retriever = TemplateRetriever()
+            from .retriever import get_retriever
+            retriever = get_retriever()
             results = retriever.retrieve_templates(query, k=1)
             
             if results:
@@ -124,3 +124,77 @@ class LetterGenerationAPI:
                 "success": False,
                 "error": str(e)
             }
+
+    async def agenerate_smart_letter(self, description: str, template_name: str = None, additional_data: Dict[str, str] = None) -> Dict[str, Any]:
+        """
+        Async variant of generate_smart_letter: retrieval overlaps with opening
+        the LLM connection and the event loop is not blocked while generating.
+        """
+        try:
+            result = await self.generator.agenerate_from_description(description, additional_data, template_name)
+            if result['success']:
+                result["method"] = "rag_generation"
+            return result
+        except Exception as e:
+            logger.error(f"Smart generation failed: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    def stream_smart_letter(self, description: str, template_name: str = None, additional_data: Dict[str, str] = None) -> Iterator[str]:
+        """
+        Streaming variant of generate_smart_letter: returns an iterator over
+        chunks of the letter text. Errors before generation starts (no LLM,
+        no matching template) are raised rather than returned.
+        """
+        return self.generator.generate_from_description_stream(description, additional_data, template_name)
+
+    def generate_smart_letters_batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Generate several letters from descriptions, batching them into
+        fewer LLM calls. Each request is a dict with "description" and
+        optional "template_name" / "additional_data" (see generate_smart_letter).
+        """
+        try:
+            results = self.generator.generate_from_descriptions(requests)
+        except Exception as e:
+            logger.error(f"Batch smart generation failed: {e}")
+            return [{"success": False, "error": str(e)} for _ in requests]
+        for result in results:
+            if result['success']:
+                result["method"] = "rag_generation"
+        return results
+
+    async def agenerate_smart_letters_batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Async generate_smart_letters_batch: one concurrent LLM call per letter,
+        for callers already running in an event loop.
+        """
+        try:
+            results = await self.generator.agenerate_from_descriptions(requests)
+        except Exception as e:
+            logger.error(f"Async batch smart generation failed: {e}")
+            return [{"success": False, "error": str(e)} for _ in requests]
+        for result in results:
+            if result['success']:
+                result["method"] = "rag_generation"
+        return results
+
+    def smart_letter_with_analysis(self, description: str, template_name: str = None, additional_data: Dict[str, str] = None) -> Dict[str, Any]:
+        """
+        Generate a letter and report missing fields with a single LLM call.
+        Same inputs as generate_smart_letter; the result also carries
+        "detected_placeholders" and "missing_fields".
+        """
+        try:
+            result = self.generator.analyze_and_generate(description, additional_data, template_name)
+            if result['success']:
+                result["method"] = "rag_generation_with_analysis"
+            return result
+        except Exception as e:
+            logger.error(f"Smart generation with analysis failed: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
@@ -4,9 +4,14 @@ Handles interaction with Mistral AI models.
 Adapted from Module A for standalone capability.
 """
 
+import asyncio
+import hashlib
 import os
+import re
 import logging
-from typing import Optional, List, Dict, Any
+import threading
+from typing import Optional, Iterator, List, Dict, Any
+from cachetools import LRUCache
 try:
     from dotenv import load_dotenv
     DOTENV_AVAILABLE = True
@@ -22,10 +27,51 @@ except ImportError as e:
     # print(f"DEBUG: Mistral import failed: {e}")
     MISTRAL_AVAILABLE = False
 
-from .config import MISTRAL_MODEL, MISTRAL_API_KEY_ENV_VAR
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+from .config import MISTRAL_MODEL, MISTRAL_API_KEY_ENV_VAR, MISTRAL_MAX_CONCURRENCY, RESPONSE_CACHE_SIZE
 
 logger = logging.getLogger(__name__)
 
+BATCH_SYSTEM_PROMPT = """
+You will receive several independent requests, each introduced by a marker line like [#1], [#2], ...
+Answer every request separately. Start each answer with its marker alone on a line,
+in the same order, and do not write anything outside the marked answers.
+"""
+
+_BATCH_MARKER_RE = re.compile(r"^[^\S\n]*\[#(\d+)\][^\S\n]*$", re.MULTILINE)
+
+# Keep-alive HTTP client shared by every MistralClient in the process, so
+# repeated calls reuse one connection instead of each paying a TLS handshake
+_HTTP_CLIENT = None
+_HTTP_CLIENT_LOCK = threading.Lock()
+
+
+def _shared_http_client():
+    """Return the shared httpx.Client (HTTP/2 when h2 is installed), or None without httpx"""
+    global _HTTP_CLIENT
+    if not HTTPX_AVAILABLE:
+        return None
+    if _HTTP_CLIENT is None:
+        with _HTTP_CLIENT_LOCK:
+            if _HTTP_CLIENT is None:
+                _HTTP_CLIENT = httpx.Client(
+                    http2=HTTP2_AVAILABLE,
+                    limits=httpx.Limits(max_keepalive_connections=20),
+                    timeout=60
+                )
+    return _HTTP_CLIENT
+
 # Load environment variables from .env file if present
 if DOTENV_AVAILABLE:
     load_dotenv()
@@ -34,6 +80,13 @@ if DOTENV_AVAILABLE:
 class MistralClient:
     """Client for interacting with Mistral API"""
     
+    # Shared preamble sent as the system message of every request unless the
+    # caller passes its own; an identical prefix lets the server reuse it
+    NEPAL_LEGAL_SYSTEM_PROMPT = (
+        "You are a helpful legal assistant for Nepal.\n"
+        "Do not add any fake information."
+    )
+    
     def __init__(self, api_key: Optional[str] = None, model: str = MISTRAL_MODEL):
         """
         Initialize Mistral client
@@ -54,10 +107,20 @@ class MistralClient:
         if not self.api_key:
             logger.warning(f"Mistral API key not found in environment variable {MISTRAL_API_KEY_ENV_VAR}")
             
+        self._warmed = False
+        
+        # Responses to temperature 0.0 requests, keyed by _cache_key
+        self._response_cache = LRUCache(maxsize=RESPONSE_CACHE_SIZE)
+        self._response_cache_lock = threading.Lock()
+        
         self.client = None
         if self.api_key:
             try:
-                self.client = Mistral(api_key=self.api_key)
+                http_client = _shared_http_client()
+                if http_client is not None:
+                    self.client = Mistral(api_key=self.api_key, client=http_client)
+                else:
+                    self.client = Mistral(api_key=self.api_key)
                 logger.info(f"Mistral client initialized with model: {self.model}")
             except Exception as e:
                 logger.error(f"Failed to initialize Mistral client: {e}")
@@ -73,7 +136,7 @@ class MistralClient:
         
         Args:
             prompt: User prompt
-            system_prompt: Optional system instruction
+            system_prompt: System instruction (default: NEPAL_LEGAL_SYSTEM_PROMPT, "" for none)
             temperature: Creativity parameter (0.0 to 1.0)
             
         Returns:
@@ -82,12 +145,16 @@ class MistralClient:
         if not self.client:
             raise ValueError("Mistral client not initialized. Check API key.")
             
-        messages = []
-        
-        if system_prompt:
-            messages.append(SystemMessage(content=system_prompt))
+        system_prompt = self._system_prompt(system_prompt)
+        cache_key = self._cache_key(prompt, system_prompt, temperature)
+        if cache_key is not None:
+            with self._response_cache_lock:
+                cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Returning cached Mistral response")
+                return cached
             
-        messages.append(UserMessage(content=prompt))
+        messages = self._build_messages(prompt, system_prompt)
         
         try:
             logger.info(f"Sending request to Mistral API (model: {self.model})")
@@ -101,8 +168,216 @@ class MistralClient:
             
             response_text = chat_response.choices[0].message.content
             logger.info("Received response from Mistral API")
+            self._cache_response(cache_key, response_text)
             return response_text
             
         except Exception as e:
             logger.error(f"Mistral API call failed: {e}")
             raise
+
+    def stream_response(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7
+    ) -> Iterator[str]:
+        """
+        Stream a response from the LLM as it is generated (uses chat.stream)
+        
+        Args:
+            prompt: User prompt
+            system_prompt: System instruction (default: NEPAL_LEGAL_SYSTEM_PROMPT, "" for none)
+            temperature: Creativity parameter (0.0 to 1.0)
+            
+        Yields:
+            Text fragments of the response, in order
+        """
+        if not self.client:
+            raise ValueError("Mistral client not initialized. Check API key.")
+            
+        messages = self._build_messages(prompt, self._system_prompt(system_prompt))
+        
+        try:
+            logger.info(f"Streaming request to Mistral API (model: {self.model})")
+            
+            for event in self.client.chat.stream(
+                model=self.model,
+                messages=messages,
+                temperature=temperature
+            ):
+                content = event.data.choices[0].delta.content
+                if content:
+                    yield content
+                    
+            logger.info("Mistral stream finished")
+            
+        except Exception as e:
+            logger.error(f"Mistral API stream failed: {e}")
+            raise
+
+    async def agenerate_response(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7
+    ) -> str:
+        """
+        Async variant of generate_response (uses chat.complete_async)
+        
+        Args:
+            prompt: User prompt
+            system_prompt: System instruction (default: NEPAL_LEGAL_SYSTEM_PROMPT, "" for none)
+            temperature: Creativity parameter (0.0 to 1.0)
+            
+        Returns:
+            Generated text response
+        """
+        if not self.client:
+            raise ValueError("Mistral client not initialized. Check API key.")
+            
+        system_prompt = self._system_prompt(system_prompt)
+        cache_key = self._cache_key(prompt, system_prompt, temperature)
+        if cache_key is not None:
+            with self._response_cache_lock:
+                cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Returning cached Mistral response")
+                return cached
+            
+        messages = self._build_messages(prompt, system_prompt)
+        
+        try:
+            logger.info(f"Sending async request to Mistral API (model: {self.model})")
+            
+            chat_response = await self.client.chat.complete_async(
+                model=self.model,
+                messages=messages,
+                temperature=temperature
+            )
+            
+            response_text = chat_response.choices[0].message.content
+            logger.info("Received response from Mistral API")
+            self._cache_response(cache_key, response_text)
+            return response_text
+            
+        except Exception as e:
+            logger.error(f"Mistral API call failed: {e}")
+            raise
+
+    async def awarm_connection(self) -> None:
+        """
+        Open the async client's connection ahead of the first completion
+        
+        Issues one cheap request (model list) so the TCP/TLS handshake is paid
+        while the caller is still busy elsewhere (e.g. retrieving a template).
+        Only the first call does anything; failures are logged and ignored.
+        """
+        if self._warmed or not self.client:
+            return
+        self._warmed = True
+        try:
+            await self.client.models.list_async()
+        except Exception as e:
+            logger.debug(f"Mistral connection warm-up failed: {e}")
+
+    async def agenerate_many(
+        self,
+        prompts: List[str],
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_concurrency: int = MISTRAL_MAX_CONCURRENCY
+    ) -> List[str]:
+        """
+        Run several prompts concurrently, at most max_concurrency at a time
+        
+        Returns:
+            One response per prompt, in order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run(prompt: str) -> str:
+            async with semaphore:
+                return await self.agenerate_response(prompt, system_prompt, temperature)
+                
+        return await asyncio.gather(*(run(p) for p in prompts))
+
+    def _system_prompt(self, system_prompt: Optional[str]) -> str:
+        """System instruction to send: the shared preamble unless one is given"""
+        return self.NEPAL_LEGAL_SYSTEM_PROMPT if system_prompt is None else system_prompt
+
+    def _cache_key(self, prompt: str, system_prompt: Optional[str], temperature: float) -> Optional[str]:
+        """Cache key for deterministic requests; None when temperature > 0 (not cacheable)"""
+        if temperature != 0.0:
+            return None
+        digest = hashlib.sha256()
+        for part in (self.model, system_prompt or "", prompt):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _cache_response(self, cache_key: Optional[str], response_text: str) -> None:
+        """Remember a response for its cache key (no-op for uncacheable requests)"""
+        if cache_key is not None and response_text is not None:
+            with self._response_cache_lock:
+                self._response_cache[cache_key] = response_text
+
+    @staticmethod
+    def _build_messages(prompt: str, system_prompt: Optional[str]) -> list:
+        """Chat messages for a prompt with an optional system instruction"""
+        messages = []
+        
+        if system_prompt:
+            messages.append(SystemMessage(content=system_prompt))
+            
+        messages.append(UserMessage(content=prompt))
+        return messages
+
+    def generate_responses_batch(
+        self,
+        prompts: List[str],
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7
+    ) -> List[str]:
+        """
+        Answer several prompts with a single API call (batch prompting)
+        
+        The prompts are tagged [#1], [#2], ... in one message and the model is
+        asked to answer under the same markers. If the reply cannot be split
+        back into one answer per prompt, each prompt is sent on its own.
+        
+        Args:
+            prompts: User prompts
+            system_prompt: System instruction shared by all prompts (default: NEPAL_LEGAL_SYSTEM_PROMPT)
+            temperature: Creativity parameter (0.0 to 1.0)
+            
+        Returns:
+            One response per prompt, in order
+        """
+        if len(prompts) <= 1:
+            return [self.generate_response(p, system_prompt, temperature) for p in prompts]
+            
+        system_prompt = self._system_prompt(system_prompt)
+        batch_prompt = "".join(f"\n\n[#{i}]\n{p}" for i, p in enumerate(prompts, 1))
+        batch_system_prompt = BATCH_SYSTEM_PROMPT
+        if system_prompt:
+            batch_system_prompt = f"{system_prompt}\n{BATCH_SYSTEM_PROMPT}"
+            
+        response = self.generate_response(batch_prompt, batch_system_prompt, temperature)
+        
+        answers = self._split_batch_response(response, len(prompts))
+        if answers is None:
+            logger.warning("Batched response could not be split by markers; sending prompts individually")
+            return [self.generate_response(p, system_prompt, temperature) for p in prompts]
+        return answers
+
+    @staticmethod
+    def _split_batch_response(response: str, count: int) -> Optional[List[str]]:
+        """Split a batched response on its [#i] markers; None unless all 1..count are present"""
+        markers = list(_BATCH_MARKER_RE.finditer(response))
+        answers = {}
+        for marker, following in zip(markers, markers[1:] + [None]):
+            end = following.start() if following else len(response)
+            answers[int(marker.group(1))] = response[marker.end():end].strip()
+        if sorted(answers) != list(range(1, count + 1)):
+            return None
+        return [answers[i] for i in range(1, count + 1)]
@@ -3,21 +3,178 @@ Retriever Module for Module C
 Finds relevant templates based on user query/intent.
 """
 
+import hashlib
 import logging
-from typing import List, Dict, Any
-from .vector_db import TemplateVectorDB
+import shelve
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+import numpy as np
+from cachetools import LRUCache
+from .config import (
+    SEMANTIC_CACHE_SIZE, SEMANTIC_CACHE_THRESHOLD,
+    EMBEDDING_CACHE_FILE, EMBEDDING_CACHE_MEMORY_SIZE
+)
+from .vector_db import create_template_db
 from module_a.embeddings import EmbeddingGenerator
 
 logger = logging.getLogger(__name__)
 
+
+class SemanticCache:
+    """
+    Small cache of retrieval results keyed by query embedding.
+    
+    Embeddings are L2-normalised on insert and kept in one contiguous
+    (capacity, dim) float32 matrix used as a ring buffer, so a lookup is a
+    single matrix-vector product. The oldest entry is overwritten when full.
+    """
+    
+    def __init__(self, capacity: int = SEMANTIC_CACHE_SIZE, threshold: float = SEMANTIC_CACHE_THRESHOLD):
+        self.capacity = capacity
+        self.threshold = threshold
+        self._matrix: Optional[np.ndarray] = None
+        self._entries: List[Optional[tuple]] = [None] * capacity  # (k, results)
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+        
+    def get(self, embedding: np.ndarray, k: int) -> Optional[List[Dict[str, Any]]]:
+        """Results of the most similar cached query with the same k, if similar enough"""
+        query = self._normalize(embedding)
+        with self._lock:
+            if self._size:
+                # Cosine scores via one BLAS gemv (rows are unit vectors)
+                scores = self._matrix[:self._size] @ query
+                # Only entries above the threshold retrieved with the same k are
+                # candidates; usually there are none or one, so avoid a full sort
+                candidates = np.flatnonzero(scores >= self.threshold)
+                for row in candidates[np.argsort(scores[candidates])[::-1]]:
+                    cached_k, results = self._entries[row]
+                    if cached_k == k:
+                        self.hits += 1
+                        return [dict(r) for r in results]
+            self.misses += 1
+        return None
+        
+    def put(self, embedding: np.ndarray, k: int, results: List[Dict[str, Any]]) -> None:
+        """Cache results for a query embedding, evicting the oldest entry when full"""
+        query = self._normalize(embedding)
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = np.zeros((self.capacity, query.shape[0]), dtype=np.float32)
+            row = self._next
+            self._matrix[row] = query
+            self._entries[row] = (k, [dict(r) for r in results])
+            self._next = (row + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+            
+    def clear(self) -> None:
+        """Drop all entries, e.g. after the template index is rebuilt"""
+        with self._lock:
+            self._entries = [None] * self.capacity
+            self._size = 0
+            self._next = 0
+
+
+class EmbeddingCache:
+    """
+    Query embeddings keyed by sha256(model name + text).
+    
+    Hot entries live in an in-memory LRU; every embedding is also written to
+    a shelve file as float32 bytes so a restarted process does not re-embed
+    queries it has already seen. If the file cannot be opened (e.g. another
+    process holds it), the cache runs in memory only.
+    """
+    
+    def __init__(self, embedder, path: Path = EMBEDDING_CACHE_FILE, memory_size: int = EMBEDDING_CACHE_MEMORY_SIZE):
+        self.embedder = embedder
+        self._memory = LRUCache(maxsize=memory_size)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        
+        self._db = None
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = shelve.open(str(path))
+        except Exception as e:
+            logger.warning(f"Embedding cache file unavailable ({e}); caching in memory only.")
+            
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.embedder.model_name}\0{text}".encode("utf-8")).hexdigest()
+        
+    def get_or_compute(self, text: str) -> np.ndarray:
+        """Embedding for text, computed only if neither cache level has it"""
+        key = self._key(text)
+        with self._lock:
+            embedding = self._memory.get(key)
+            if embedding is None and self._db is not None:
+                raw = self._db.get(key)
+                if raw is not None:
+                    embedding = np.frombuffer(raw, dtype=np.float32)
+                    self._memory[key] = embedding
+            if embedding is not None:
+                self.hits += 1
+                return embedding
+            self.misses += 1
+            
+        embedding = np.asarray(self.embedder.generate_embedding(text), dtype=np.float32)
+        with self._lock:
+            self._memory[key] = embedding
+            if self._db is not None:
+                self._db[key] = embedding.tobytes()
+                self._db.sync()
+        return embedding
+        
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+        
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
 class TemplateRetriever:
     """
     Retrieves the most relevant letter templates for a given user query.
     """
     
     def __init__(self):
-        self.db = TemplateVectorDB()
         self.embedder = EmbeddingGenerator()
+        self.db = create_template_db(warmup_dim=self.embedder.get_embedding_dimension())
+        self.embedding_cache = EmbeddingCache(self.embedder)
+        self.cache = SemanticCache()
+        # The indexer rewrites the hashes file on every rebuild; its mtime
+        # tells when cached results may refer to changed or deleted templates
+        self._hashes_file = Path(self.db.persist_directory) / self.db.HASHES_FILENAME
+        self._index_version = self._current_index_version()
+        
+    def _current_index_version(self) -> Optional[int]:
+        try:
+            return self._hashes_file.stat().st_mtime_ns
+        except OSError:
+            return None
+        
+    def _check_index_version(self) -> None:
+        """Clear the semantic cache if the index was rebuilt since the last query"""
+        version = self._current_index_version()
+        if version != self._index_version:
+            logger.info("Template index changed; clearing semantic cache.")
+            self.cache.clear()
+            self._index_version = version
         
     def retrieve_templates(self, query: str, k: int = 1) -> List[Dict[str, Any]]:
         """
@@ -26,24 +183,52 @@ class TemplateRetriever:
         logger.info(f"Retrieving templates for query: {query}")
         
         # 1. Embed Query
-        query_embedding = self.embedder.generate_embedding(query)
+        query_embedding = self.embedding_cache.get_or_compute(query)
+        logger.debug(f"Embedding cache hit rate: {self.embedding_cache.hit_rate:.1%}")
+        
+        # Near-duplicate of a recent query: reuse its templates
+        self._check_index_version()
+        cached = self.cache.get(query_embedding, k)
+        if cached is not None:
+            logger.info(f"Semantic cache hit ({len(cached)} templates).")
+            return cached
         
-        # 2. Query DB
-        results = self.db.query_with_embedding(query_embedding.tolist(), n_results=k)
+        # 2. Query DB for ids and distances only, then fetch the hits' texts
+        results = self.db.query_with_embedding(
+            query_embedding.tolist(), n_results=k, include=["distances"]
+        )
+        ids = results['ids'][0]
+        templates = self.db.get_templates(ids)
         
-        # 3. Format Results
+        # 3. Format Results (in ranking order)
         retrieved = []
-        if results['documents'][0]:
-            for i, doc in enumerate(results['documents'][0]):
-                metadata = results['metadatas'][0][i]
-                distance = results['distances'][0][i]
-                
-                retrieved.append({
-                    "filename": results['ids'][0][i],
-                    "content": doc,
-                    "metadata": metadata,
-                    "score": 1.0 - distance # Approximate similarity score
-                })
+        for template_id, distance in zip(ids, results['distances'][0]):
+            template = templates.get(template_id)
+            if template is None:
+                continue
+            retrieved.append({
+                "filename": template_id,
+                "content": template["document"],
+                "metadata": template["metadata"],
+                "score": 1.0 - distance # Approximate similarity score
+            })
                 
         logger.info(f"Found {len(retrieved)} templates.")
+        self.cache.put(query_embedding, k, retrieved)
         return retrieved
+
+
+# Process-wide retriever: loading the embedding model and opening the Chroma
+# client dominate the cost of a retrieval, so they are done once
+_RETRIEVER: Optional[TemplateRetriever] = None
+_RETRIEVER_LOCK = threading.Lock()
+
+
+def get_retriever() -> TemplateRetriever:
+    """Return the shared TemplateRetriever, creating it on first use"""
+    global _RETRIEVER
+    if _RETRIEVER is None:
+        with _RETRIEVER_LOCK:
+            if _RETRIEVER is None:
+                _RETRIEVER = TemplateRetriever()
+    return _RETRIEVER
@@ -5,12 +5,39 @@ Handles loading and parsing of letter templates.
 
 import re
 import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Set
+from typing import FrozenSet, List, Dict, Set
 from .config import TEMPLATE_DIR
 
 logger = logging.getLogger(__name__)
 
+# Placeholder patterns: [Key], {{Key}}, <Key> and {Key}
+_BRACKET_RE = re.compile(r'\[(.*?)\]')
+_CURLY2_RE = re.compile(r'\{\{(.*?)\}\}')
+_ANGLE_RE = re.compile(r'<(.*?)>')
+# {Key} where Key doesn't contain { or }, and not part of {{Key}}
+_CURLY1_RE = re.compile(r'(?<!\{)\{([^{}]+)\}(?!\})')
+_PLACEHOLDER_PATTERNS = (_BRACKET_RE, _CURLY2_RE, _ANGLE_RE, _CURLY1_RE)
+
+
+@lru_cache(maxsize=128)
+def _read_template(path_str: str, mtime_ns: int) -> str:
+    """Read a template file; cached per modification time so edits are picked up"""
+    return Path(path_str).read_text(encoding='utf-8')
+
+
+@lru_cache(maxsize=128)
+def _extract_placeholders(template_text: str) -> FrozenSet[str]:
+    """Placeholders found in a template text; cached per text"""
+    placeholders = set()
+    for pattern in _PLACEHOLDER_PATTERNS:
+        placeholders.update(pattern.findall(template_text))
+    
+    # Filter out empty strings or purely structural tags if any
+    return frozenset(p.strip() for p in placeholders if p.strip())
+
+
 class TemplateLoader:
     """
     Responsible for discovering, loading, and parsing letter templates.
@@ -38,11 +65,13 @@ class TemplateLoader:
         """
         template_path = self.template_dir / template_name
         
-        if not template_path.exists():
+        try:
+            mtime_ns = template_path.stat().st_mtime_ns
+        except FileNotFoundError:
             raise FileNotFoundError(f"Template not found: {template_name}")
             
         try:
-            return template_path.read_text(encoding='utf-8')
+            return _read_template(str(template_path), mtime_ns)
         except Exception as e:
             logger.error(f"Error loading template {template_name}: {e}")
             raise
@@ -55,26 +84,4 @@ class TemplateLoader:
         - {{Placeholder Name}}
         - <Placeholder Name>
         """
-        placeholders = set()
-        
-        # Regex for [Placeholder]
-        bracket_matches = re.findall(r'\[(.*?)\]', template_text)
-        placeholders.update(bracket_matches)
-        
-        # Regex for {{Placeholder}}
-        curly_matches = re.findall(r'\{\{(.*?)\}\}', template_text)
-        placeholders.update(curly_matches)
-        
-        # Regex for <Placeholder>
-        angle_matches = re.findall(r'<(.*?)>', template_text)
-        placeholders.update(angle_matches)
-
-        # Regex for {Placeholder} - careful to avoid double braces if possible, 
-        # but for now we just want to catch {Key}
-        # We use a negative lookahead/lookbehind or just simple matching for {Key} 
-        # where Key doesn't contain { or }
-        single_curly_matches = re.findall(r'(?<!\{)\{([^{}]+)\}(?!\})', template_text)
-        placeholders.update(single_curly_matches)
-        
-        # Filter out empty strings or purely structural tags if any
-        return {p.strip() for p in placeholders if p.strip()}
+        return set(_extract_placeholders(template_text))
@@ -3,9 +3,13 @@ Vector database module for Module C (Letter Templates)
 Stores and retrieves letter templates with embeddings.
 """
 
+import json
 import logging
+import os
+import threading
+import time
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Callable, Iterable, List, Dict, Any, Optional
 
 try:
     import chromadb
@@ -13,19 +17,82 @@ try:
 except ImportError:
     CHROMADB_AVAILABLE = False
 
-from .config import DATA_DIR
+try:
+    import numpy as np
+    from usearch.index import Index
+    USEARCH_AVAILABLE = True
+except ImportError:
+    USEARCH_AVAILABLE = False
+
+from .config import CHROMA_HNSW_NUM_THREADS, DATA_DIR, INDEX_EMBEDDING_BATCH_SIZE, VECTOR_DB_BACKEND
 
 logger = logging.getLogger(__name__)
 
 # Define Vector DB path for Module C
 VECTOR_DB_DIR = DATA_DIR / "vector_db"
 
+# Collections use HNSW with cosine distance, so 1 - distance is a similarity.
+# The distance function and graph parameters are fixed when a collection is
+# created; a larger construction_ef / M gives a better graph (higher recall)
+# at a one-off build cost.
+COLLECTION_METADATA = {
+    "description": "Nepal letter templates for RAG generation",
+    "hnsw:space": "cosine",
+    "hnsw:construction_ef": 200,
+    "hnsw:M": 32
+}
+if CHROMA_HNSW_NUM_THREADS:
+    COLLECTION_METADATA["hnsw:num_threads"] = CHROMA_HNSW_NUM_THREADS
+
+# Templates written per Chroma call; one SQLite transaction per slice
+CHROMA_BATCH_SIZE = 200
+
+# SQLite settings for bulk ingest (see TemplateVectorDB(fast_ingest=True))
+FAST_INGEST_PRAGMAS = (
+    "PRAGMA journal_mode=OFF",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA locking_mode=EXCLUSIVE",
+)
+
+# Embedding model used by add_texts, loaded on first use
+_EMBEDDER = None
+_EMBEDDER_LOCK = threading.Lock()
+
+
+def _get_embedder():
+    """Return the shared EmbeddingGenerator (same model as query embeddings)"""
+    global _EMBEDDER
+    if _EMBEDDER is None:
+        with _EMBEDDER_LOCK:
+            if _EMBEDDER is None:
+                from module_a.embeddings import EmbeddingGenerator
+                _EMBEDDER = EmbeddingGenerator()
+    return _EMBEDDER
+
 class TemplateVectorDB:
     """ChromaDB vector database for letter templates"""
     
-    def __init__(self, persist_directory: Path = VECTOR_DB_DIR):
+    # Per-backend file where the indexer records the content hash of each template
+    HASHES_FILENAME = "template_hashes.json"
+    
+    def __init__(
+        self,
+        persist_directory: Path = VECTOR_DB_DIR,
+        fast_ingest: bool = False,
+        warmup_dim: Optional[int] = None
+    ):
         """
         Initialize ChromaDB with persistent storage
+        
+        fast_ingest applies FAST_INGEST_PRAGMAS to this process's SQLite
+        connection: no rollback journal, no fsync and an exclusive lock.
+        Writes become much faster but a crash mid-write can corrupt the
+        store (rebuild it with the indexer), and other processes cannot
+        read it meanwhile. Use it for offline indexing only.
+        
+        warmup_dim (the embedding dimension) runs a throwaway query so the
+        HNSW index is loaded from disk now rather than on the first request.
         """
         if not CHROMADB_AVAILABLE:
             raise ImportError(
@@ -43,23 +110,151 @@ class TemplateVectorDB:
             path=str(self.persist_directory)
         )
         
+        if fast_ingest:
+            self._apply_fast_ingest_pragmas()
+        
         # Create or get collection
         self.collection_name = "nepal_letter_templates"
         self.collection = self.client.get_or_create_collection(
             name=self.collection_name,
-            metadata={"description": "Nepal letter templates for RAG generation"}
+            metadata=COLLECTION_METADATA
         )
+        if not self.has_expected_space():
+            logger.warning(
+                f"Collection '{self.collection_name}' does not use cosine distance; "
+                "rebuild the index (python -m module_c.indexer) to migrate it."
+            )
         
         current_count = self.collection.count()
         logger.info(f"Collection '{self.collection_name}' ready. Count: {current_count}")
+        
+        if warmup_dim and current_count > 0:
+            self._warm_up(warmup_dim)
     
+    def _warm_up(self, dim: int) -> None:
+        """
+        Load the HNSW index with a dummy query; the result is discarded
+        """
+        try:
+            self.collection.query(query_embeddings=[[0.0] * dim], n_results=1, include=["distances"])
+            logger.info("HNSW index warmed up.")
+        except Exception as e:
+            logger.warning(f"Index warm-up query failed: {e}")
+    
+    def _apply_fast_ingest_pragmas(self) -> None:
+        """
+        Run FAST_INGEST_PRAGMAS on Chroma's SQLite connection for this thread.
+        Relies on Chroma internals, so failures only log a warning.
+        """
+        try:
+            from chromadb.db.impl.sqlite import SqliteDB
+            conn = self.client._system.instance(SqliteDB)._conn_pool.connect()
+            for pragma in FAST_INGEST_PRAGMAS:
+                conn.execute(pragma)
+            logger.info("Fast-ingest SQLite PRAGMAs applied.")
+        except Exception as e:
+            logger.warning(f"Could not apply fast-ingest PRAGMAs: {e}")
+
+    def count(self) -> int:
+        """
+        Number of templates stored
+        """
+        return self.collection.count()
+
+    def has_expected_space(self) -> bool:
+        """
+        Whether the collection was created with the configured distance function
+        """
+        metadata = self.collection.metadata or {}
+        return metadata.get("hnsw:space", "l2") == COLLECTION_METADATA["hnsw:space"]
+
+    def reset(self) -> None:
+        """
+        Drop the collection and recreate it empty with COLLECTION_METADATA
+        """
+        self.client.delete_collection(self.collection_name)
+        self.collection = self.client.create_collection(
+            name=self.collection_name,
+            metadata=COLLECTION_METADATA
+        )
+        logger.info(f"Collection '{self.collection_name}' reset.")
+
     def add_templates(
         self,
         templates: List[Dict[str, Any]],
-        embeddings: List[List[float]]
+        embeddings: List[List[float]],
+        batch_size: int = CHROMA_BATCH_SIZE
     ) -> None:
         """
-        Add templates with embeddings to the database
+        Add templates with embeddings to the database, batch_size per call
+        """
+        self._write_batches(self.collection.add, templates, embeddings, batch_size)
+        logger.info(f"Added {len(templates)} templates to DB.")
+
+    def add_texts(
+        self,
+        templates: List[Dict[str, Any]],
+        batch_size: int = CHROMA_BATCH_SIZE
+    ) -> None:
+        """
+        Embed templates' text in one batched encoder call and add them
+        (templates as for add_templates: dicts with id, text and metadata)
+        """
+        embeddings = _get_embedder().generate_embeddings_batch(
+            [t['text'] for t in templates],
+            batch_size=INDEX_EMBEDDING_BATCH_SIZE,
+            show_progress=False,
+            normalize=True
+        )
+        self.add_templates(templates, embeddings.tolist(), batch_size=batch_size)
+
+    def add_templates_streaming(
+        self,
+        templates: Iterable[Dict[str, Any]],
+        embeddings: Iterable[List[float]],
+        batch_size: int = CHROMA_BATCH_SIZE
+    ) -> int:
+        """
+        Add templates from (possibly lazy) iterables, flushing every batch_size
+        Returns the number of templates added
+        """
+        pending_templates, pending_embeddings = [], []
+        total = 0
+        for template, embedding in zip(templates, embeddings):
+            pending_templates.append(template)
+            pending_embeddings.append(embedding)
+            if len(pending_templates) >= batch_size:
+                self._write_batches(self.collection.add, pending_templates, pending_embeddings, batch_size)
+                total += len(pending_templates)
+                pending_templates, pending_embeddings = [], []
+        if pending_templates:
+            self._write_batches(self.collection.add, pending_templates, pending_embeddings, batch_size)
+            total += len(pending_templates)
+        logger.info(f"Added {total} templates to DB.")
+        return total
+
+    def upsert_templates(
+        self,
+        templates: List[Dict[str, Any]],
+        embeddings: List[List[float]],
+        batch_size: int = CHROMA_BATCH_SIZE
+    ) -> None:
+        """
+        Insert templates or replace existing ones with the same id, batch_size per call
+        """
+        self._write_batches(self.collection.upsert, templates, embeddings, batch_size)
+        logger.info(f"Upserted {len(templates)} templates to DB.")
+
+    @staticmethod
+    def _write_batches(
+        write: Callable[..., Any],
+        templates: List[Dict[str, Any]],
+        embeddings: List[List[float]],
+        batch_size: int
+    ) -> None:
+        """
+        Send templates to a collection write method (add/upsert) in slices of
+        batch_size. A failing slice is retried once before the error propagates.
         """
         if len(templates) != len(embeddings):
             raise ValueError("Number of templates must match number of embeddings")
@@ -68,23 +263,284 @@ class TemplateVectorDB:
         documents = [t['text'] for t in templates]
         metadatas = [t['metadata'] for t in templates]
         
-        self.collection.add(
-            ids=ids,
-            documents=documents,
-            embeddings=embeddings,
-            metadatas=metadatas
-        )
-        logger.info(f"Added {len(templates)} templates to DB.")
+        for start in range(0, len(ids), batch_size):
+            end = start + batch_size
+            batch = dict(
+                ids=ids[start:end],
+                documents=documents[start:end],
+                embeddings=embeddings[start:end],
+                metadatas=metadatas[start:end]
+            )
+            started = time.perf_counter()
+            try:
+                write(**batch)
+            except Exception as e:
+                logger.warning(f"Batch {start}-{end} failed ({e}); retrying once.")
+                write(**batch)
+            logger.debug(f"Wrote {len(batch['ids'])} templates in {time.perf_counter() - started:.3f}s")
+
+    def delete_templates(self, ids: List[str]) -> None:
+        """
+        Delete templates by id
+        """
+        self.collection.delete(ids=ids)
+        logger.info(f"Deleted {len(ids)} templates from DB.")
 
     def query_with_embedding(
         self,
         query_embedding: List[float],
-        n_results: int = 3
+        n_results: int = 3,
+        include: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """
         Query with pre-computed embedding
+        
+        Only ids and distances are returned by default (include=["distances"]);
+        fetch texts and metadata for the hits with get_templates, or pass e.g.
+        include=["documents", "metadatas", "distances"] explicitly.
         """
         return self.collection.query(
             query_embeddings=[query_embedding],
-            n_results=n_results
+            n_results=n_results,
+            include=include if include is not None else ["distances"]
         )
+
+    def get_templates(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch text and metadata for the given template ids
+        Returns {id: {"document": ..., "metadata": ...}}; unknown ids are omitted.
+        """
+        if not ids:
+            return {}
+        results = self.collection.get(ids=list(ids), include=["documents", "metadatas"])
+        return {
+            template_id: {"document": document, "metadata": metadata}
+            for template_id, document, metadata in zip(
+                results["ids"], results["documents"], results["metadatas"]
+            )
+        }
+
+
+class UsearchTemplateDB:
+    """
+    usearch-backed alternative to TemplateVectorDB (VECTOR_DB_BACKEND=usearch)
+    
+    Vectors live in a usearch HNSW index file that is memory-mapped for
+    queries (Index.restore(view=True)), so resident memory stays close to the
+    size of the touched pages rather than the whole index. Template ids, texts
+    and metadata are kept in a JSON sidecar keyed by the integer usearch key.
+    Writes load the index fully, modify it and save it before re-mapping.
+    """
+    
+    HASHES_FILENAME = "template_hashes_usearch.json"
+    
+    def __init__(
+        self,
+        persist_directory: Path = VECTOR_DB_DIR,
+        fast_ingest: bool = False,
+        warmup_dim: Optional[int] = None
+    ):
+        """
+        Open (or prepare) the usearch index in persist_directory
+        fast_ingest and warmup_dim are accepted for interface parity and have
+        no effect; the index is memory-mapped when it is opened.
+        """
+        if not USEARCH_AVAILABLE:
+            raise ImportError(
+                "usearch not installed. "
+                "Install with: pip install usearch"
+            )
+        
+        self.persist_directory = Path(persist_directory)
+        self.persist_directory.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.persist_directory / "templates.usearch"
+        self.records_path = self.persist_directory / "templates_usearch.json"
+        
+        self._lock = threading.Lock()
+        self._load_records()
+        self._index = None
+        if self.index_path.exists() and self._records:
+            self._index = Index.restore(str(self.index_path), view=True)
+        
+        logger.info(f"usearch template index ready at {self.index_path}. Count: {self.count()}")
+
+    def _load_records(self) -> None:
+        state = {}
+        if self.records_path.exists():
+            with open(self.records_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        self._records: Dict[str, Dict[str, Any]] = state.get("records", {})
+        self._next_key: int = state.get("next_key", 0)
+        self._ndim: Optional[int] = state.get("ndim")
+        self._ids_by_key = {record["key"]: template_id for template_id, record in self._records.items()}
+
+    def _save_records(self) -> None:
+        tmp_path = self.records_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(
+                {"records": self._records, "next_key": self._next_key, "ndim": self._ndim},
+                f, ensure_ascii=False
+            )
+        tmp_path.replace(self.records_path)
+
+    def _writable_index(self, ndim: int) -> "Index":
+        """Fully loaded copy of the index for modification"""
+        index = Index(ndim=ndim, metric="cos", dtype="f32")
+        if self.index_path.exists() and self._records:
+            index.load(str(self.index_path))
+        return index
+
+    def _commit(self, index: "Index") -> None:
+        """
+        Persist index and sidecar, then switch queries to the new mapping
+        
+        The live index file is memory-mapped here and possibly by other
+        processes, so it is never rewritten in place: the new index is saved
+        next to it and renamed over it, which leaves existing mappings on the
+        old file intact. The sidecar is written first so every key in the
+        swapped-in index has a record.
+        """
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        index.save(str(tmp_path))
+        self._save_records()
+        os.replace(tmp_path, self.index_path)
+        self._ids_by_key = {record["key"]: template_id for template_id, record in self._records.items()}
+        self._index = Index.restore(str(self.index_path), view=True) if self._records else None
+
+    def count(self) -> int:
+        """
+        Number of templates stored
+        """
+        return len(self._records)
+
+    def has_expected_space(self) -> bool:
+        """
+        The index is always created with cosine distance
+        """
+        return True
+
+    def reset(self) -> None:
+        """
+        Remove all templates
+        """
+        with self._lock:
+            self._index = None
+            for path in (self.index_path, self.records_path):
+                if path.exists():
+                    path.unlink()
+            self._load_records()
+        logger.info("usearch template index reset.")
+
+    def add_templates(
+        self,
+        templates: List[Dict[str, Any]],
+        embeddings: List[List[float]],
+        batch_size: int = CHROMA_BATCH_SIZE
+    ) -> None:
+        """
+        Add templates with embeddings (existing ids are replaced)
+        """
+        self.upsert_templates(templates, embeddings, batch_size)
+
+    def upsert_templates(
+        self,
+        templates: List[Dict[str, Any]],
+        embeddings: List[List[float]],
+        batch_size: int = CHROMA_BATCH_SIZE
+    ) -> None:
+        """
+        Insert templates or replace existing ones with the same id
+        batch_size is accepted for interface parity; the index is written once.
+        """
+        if len(templates) != len(embeddings):
+            raise ValueError("Number of templates must match number of embeddings")
+        if not templates:
+            return
+        
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        with self._lock:
+            if self._ndim is None:
+                self._ndim = int(vectors.shape[1])
+            index = self._writable_index(self._ndim)
+            
+            stale = [self._records[t['id']]["key"] for t in templates if t['id'] in self._records]
+            if stale:
+                index.remove(np.asarray(stale, dtype=np.uint64))
+            
+            keys = np.arange(self._next_key, self._next_key + len(templates), dtype=np.uint64)
+            self._next_key += len(templates)
+            index.add(keys, vectors)
+            for key, template in zip(keys.tolist(), templates):
+                self._records[template['id']] = {
+                    "key": key,
+                    "text": template['text'],
+                    "metadata": template['metadata']
+                }
+            self._commit(index)
+        logger.info(f"Upserted {len(templates)} templates to usearch index.")
+
+    def delete_templates(self, ids: List[str]) -> None:
+        """
+        Delete templates by id
+        """
+        with self._lock:
+            keys = [self._records.pop(template_id)["key"] for template_id in ids if template_id in self._records]
+            if keys and self._ndim is not None:
+                index = self._writable_index(self._ndim)
+                index.remove(np.asarray(keys, dtype=np.uint64))
+                self._commit(index)
+        logger.info(f"Deleted {len(ids)} templates from usearch index.")
+
+    def query_with_embedding(
+        self,
+        query_embedding: List[float],
+        n_results: int = 3,
+        include: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Query with pre-computed embedding
+        Returns the same nested-list layout as a Chroma query result,
+        restricted to the keys in include (default: ids and distances).
+        """
+        include = include if include is not None else ["distances"]
+        ids, documents, metadatas, distances = [], [], [], []
+        index = self._index
+        if index is not None:
+            matches = index.search(np.asarray(query_embedding, dtype=np.float32), n_results)
+            for key, distance in zip(matches.keys.tolist(), matches.distances.tolist()):
+                template_id = self._ids_by_key.get(key)
+                record = self._records.get(template_id)
+                if record is None:
+                    continue
+                ids.append(template_id)
+                documents.append(record["text"])
+                metadatas.append(record["metadata"])
+                distances.append(distance)
+        results = {"ids": [ids], "documents": [documents], "metadatas": [metadatas], "distances": [distances]}
+        return {key: value for key, value in results.items() if key == "ids" or key in include}
+
+    def get_templates(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch text and metadata for the given template ids
+        Returns {id: {"document": ..., "metadata": ...}}; unknown ids are omitted.
+        """
+        return {
+            template_id: {
+                "document": self._records[template_id]["text"],
+                "metadata": self._records[template_id]["metadata"],
+            }
+            for template_id in ids
+            if template_id in self._records
+        }
+
+
+def create_template_db(**kwargs):
+    """
+    Template vector store for the configured VECTOR_DB_BACKEND
+    ("chroma" -> TemplateVectorDB, "usearch" -> UsearchTemplateDB)
+    """
+    if VECTOR_DB_BACKEND == "usearch":
+        return UsearchTemplateDB(**kwargs)
+    if VECTOR_DB_BACKEND != "chroma":
+        logger.warning(f"Unknown VECTOR_DB_BACKEND '{VECTOR_DB_BACKEND}'; using chroma.")
+    return TemplateVectorDB(**kwargs)
@@ -4,10 +4,18 @@ Run this to verify the HITL implementation is working correctly
 """
 
 import requests
-import json
+from requests.adapters import HTTPAdapter
+import orjson
 import sys
 from pathlib import Path
 
+try:
+    # Streams multipart uploads instead of building the whole body in memory
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+    TOOLBELT_AVAILABLE = True
+except ImportError:
+    TOOLBELT_AVAILABLE = False
+
 # Configuration
 API_BASE = "http://localhost:8000/api/v1/bias-detection-hitl"
 AUTH_TOKEN = "YOUR_AUTH_TOKEN_HERE"  # Replace with actual token
@@ -15,6 +23,13 @@ AUTH_TOKEN = "YOUR_AUTH_TOKEN_HERE"  # Replace with actual token
 # Sample PDF path (update this to your test PDF)
 TEST_PDF_PATH = "path/to/test/document.pdf"
 
+# One keep-alive session for every request, so the workflow reuses connections
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+SESSION.headers.update({'Authorization': f'Bearer {AUTH_TOKEN}'})
+
 
 def print_section(title):
     """Print a formatted section header"""
@@ -23,9 +38,19 @@ def print_section(title):
     print("="*60)
 
 
-def print_json(data, indent=2):
+def print_json(data):
     """Pretty print JSON data"""
-    print(json.dumps(data, indent=indent, ensure_ascii=False))
+    print(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode())
+
+
+def post_json(path, payload, **kwargs):
+    """POST a JSON body serialized with orjson"""
+    return SESSION.post(
+        f"{API_BASE}{path}",
+        data=orjson.dumps(payload),
+        headers={'Content-Type': 'application/json'},
+        **kwargs
+    )
 
 
 def test_health_check():
@@ -33,11 +58,11 @@ def test_health_check():
     print_section("TEST 1: Health Check")
 
     try:
-        response = requests.get(f"{API_BASE}/health")
+        response = SESSION.get(f"{API_BASE}/health")
         response.raise_for_status()
 
         print("✓ Health check passed")
-        print_json(response.json())
+        print_json(orjson.loads(response.content))
         return True
 
     except Exception as e:
@@ -56,22 +81,28 @@ def test_start_review(pdf_path):
 
     try:
         with open(pdf_path, 'rb') as f:
-            files = {'file': f}
             data = {
                 'refine_with_llm': 'true',
                 'confidence_threshold': '0.7'
             }
-            headers = {'Authorization': f'Bearer {AUTH_TOKEN}'}
-
-            response = requests.post(
-                f"{API_BASE}/start-review",
-                files=files,
-                data=data,
-                headers=headers
-            )
+            if TOOLBELT_AVAILABLE:
+                encoder = MultipartEncoder(
+                    fields={**data, 'file': (Path(pdf_path).name, f, 'application/pdf')}
+                )
+                response = SESSION.post(
+                    f"{API_BASE}/start-review",
+                    data=encoder,
+                    headers={'Content-Type': encoder.content_type}
+                )
+            else:
+                response = SESSION.post(
+                    f"{API_BASE}/start-review",
+                    files={'file': f},
+                    data=data
+                )
             response.raise_for_status()
 
-        result = response.json()
+        result = orjson.loads(response.content)
 
         print("✓ Review session started successfully")
         print(f"\nSession ID: {result['session_id']}")
@@ -87,7 +118,8 @@ def test_start_review(pdf_path):
             print(f"  Original: {sentence['original_sentence']}")
             print(f"  Category: {sentence['category']}")
             print(f"  Confidence: {sentence['confidence']:.2f}")
-            print(f"  Suggestion: {sentence['suggestion']}")
+            # Omitted from the response when suggestion generation failed
+            print(f"  Suggestion: {sentence.get('suggestion', '(none)')}")
 
         return result
 
@@ -105,14 +137,10 @@ def test_get_session_status(session_id):
     print_section("TEST 3: Get Session Status")
 
     try:
-        headers = {'Authorization': f'Bearer {AUTH_TOKEN}'}
-        response = requests.get(
-            f"{API_BASE}/session/{session_id}",
-            headers=headers
-        )
+        response = SESSION.get(f"{API_BASE}/session/{session_id}")
         response.raise_for_status()
 
-        result = response.json()
+        result = orjson.loads(response.content)
 
         print("✓ Session status retrieved")
         print(f"\nStatus: {result['status']}")
@@ -132,10 +160,6 @@ def test_approve_suggestion(session_id, sentence_id, suggestion):
     print_section("TEST 4: Approve Suggestion")
 
     try:
-        headers = {
-            'Authorization': f'Bearer {AUTH_TOKEN}',
-            'Content-Type': 'application/json'
-        }
         data = {
             'session_id': session_id,
             'sentence_id': sentence_id,
@@ -143,14 +167,10 @@ def test_approve_suggestion(session_id, sentence_id, suggestion):
             'approved_suggestion': suggestion
         }
 
-        response = requests.post(
-            f"{API_BASE}/approve-suggestion",
-            json=data,
-            headers=headers
-        )
+        response = post_json("/approve-suggestion", data)
         response.raise_for_status()
 
-        result = response.json()
+        result = orjson.loads(response.content)
 
         print(f"✓ {result['message']}")
         return True
@@ -165,10 +185,6 @@ def test_reject_and_regenerate(session_id, sentence_id):
     print_section("TEST 5: Reject and Regenerate")
 
     try:
-        headers = {
-            'Authorization': f'Bearer {AUTH_TOKEN}',
-            'Content-Type': 'application/json'
-        }
 
         # Step 1: Reject
         print("Rejecting suggestion...")
@@ -178,11 +194,7 @@ def test_reject_and_regenerate(session_id, sentence_id):
             'action': 'reject'
         }
 
-        response = requests.post(
-            f"{API_BASE}/approve-suggestion",
-            json=reject_data,
-            headers=headers
-        )
+        response = post_json("/approve-suggestion", reject_data)
         response.raise_for_status()
         print("✓ Suggestion rejected")
 
@@ -193,14 +205,10 @@ def test_reject_and_regenerate(session_id, sentence_id):
             'sentence_id': sentence_id
         }
 
-        response = requests.post(
-            f"{API_BASE}/regenerate-suggestion",
-            json=regen_data,
-            headers=headers
-        )
+        response = post_json("/regenerate-suggestion", regen_data)
         response.raise_for_status()
 
-        result = response.json()
+        result = orjson.loads(response.content)
         print("✓ New suggestion generated")
         print(f"New Suggestion: {result['new_suggestion']}")
 
@@ -216,22 +224,15 @@ def test_generate_pdf(session_id, output_path="test_debiased.pdf"):
     print_section("TEST 6: Generate PDF")
 
     try:
-        headers = {
-            'Authorization': f'Bearer {AUTH_TOKEN}',
-            'Content-Type': 'application/json'
-        }
         data = {'session_id': session_id}
 
-        response = requests.post(
-            f"{API_BASE}/generate-pdf",
-            json=data,
-            headers=headers
-        )
-        response.raise_for_status()
+        with post_json("/generate-pdf", data, stream=True) as response:
+            response.raise_for_status()
 
-        # Save PDF
-        with open(output_path, 'wb') as f:
-            f.write(response.content)
+            # Save PDF as it arrives
+            with open(output_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    f.write(chunk)
 
         changes = response.headers.get('X-Changes-Applied', 'unknown')
         print(f"✓ PDF generated successfully")
@@ -279,11 +280,14 @@ def run_complete_workflow():
 
     # Test 4: Approve first biased sentence
     first_sentence = biased_sentences[0]
-    test_approve_suggestion(
-        session_id,
-        first_sentence['sentence_id'],
-        first_sentence['suggestion']
-    )
+    if first_sentence.get('suggestion'):
+        test_approve_suggestion(
+            session_id,
+            first_sentence['sentence_id'],
+            first_sentence['suggestion']
+        )
+    else:
+        print(f"\n⚠ No suggestion for sentence {first_sentence['sentence_id']}; skipping approval.")
 
     # Test 5: Reject and regenerate (if there's a second biased sentence)
     if len(biased_sentences) > 1:
@@ -304,6 +308,9 @@ def run_complete_workflow():
     # Auto-approve remaining sentences for testing
     print_section("Auto-approving remaining sentences")
     for sentence in biased_sentences[2:]:
+        if not sentence.get('suggestion'):
+            print(f"⚠ No suggestion for sentence {sentence['sentence_id']}; skipping approval.")
+            continue
         test_approve_suggestion(
             session_id,
             sentence['sentence_id'],
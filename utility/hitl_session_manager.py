@@ -3,11 +3,18 @@ Human-in-the-Loop Session Manager
 Manages review sessions for bias detection with user approval workflow
 """
 
+import time
 import uuid
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional
 from api.schemas import BiasReviewSession, BiasReviewItem
 
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
 class HITLSessionManager:
     """
     Manages in-memory sessions for human-in-the-loop bias detection workflow.
@@ -49,21 +56,58 @@ class HITLSessionManager:
             status="pending_review"
         )
 
-        self._sessions[session_id] = session
+        self._save_session(session)
         return session
 
-    def get_session(self, session_id: str) -> Optional[BiasReviewSession]:
+    def _save_session(self, session: BiasReviewSession) -> None:
+        """
+        Persist a session after it was created or modified.
+
+        In-memory sessions are mutated in place, so this only needs to
+        register new ones. Shared stores override it to write back changes.
+        """
+        self._sessions[session.session_id] = session
+
+    def get_session(self, session_id: str, include_pdf: bool = True) -> Optional[BiasReviewSession]:
         """
         Retrieve a session by ID.
 
         Args:
             session_id: Session identifier
+            include_pdf: Whether original_pdf_bytes is needed. Shared stores
+                skip fetching the PDF when False; callers must not rely on
+                original_pdf_bytes then.
 
         Returns:
             BiasReviewSession if found, None otherwise
         """
         return self._sessions.get(session_id)
 
+    def _load_session(self, session_id: str) -> Optional[BiasReviewSession]:
+        """Retrieve a session for status checks that don't need the PDF."""
+        return self.get_session(session_id, include_pdf=False)
+
+    def _update_session(
+        self,
+        session_id: str,
+        mutate: Callable[[BiasReviewSession], bool]
+    ) -> bool:
+        """
+        Apply an in-place change to a session and persist it.
+
+        Args:
+            session_id: Session identifier
+            mutate: Called with the session; returns True if it changed it
+
+        Returns:
+            True if the session exists and was changed, False otherwise
+        """
+        session = self._load_session(session_id)
+        if not session or not mutate(session):
+            return False
+        self._save_session(session)
+        return True
+
     def update_sentence_status(
         self,
         session_id: str,
@@ -83,23 +127,20 @@ class HITLSessionManager:
         Returns:
             True if update successful, False otherwise
         """
-        session = self.get_session(session_id)
-        if not session:
+        def mutate(session: BiasReviewSession) -> bool:
+            for sentence in session.sentences:
+                if sentence.sentence_id == sentence_id:
+                    sentence.status = status
+                    if approved_suggestion:
+                        sentence.approved_suggestion = approved_suggestion
+
+                    # Update session status to in_progress once first action taken
+                    if session.status == "pending_review":
+                        session.status = "in_progress"
+                    return True
             return False
 
-        for sentence in session.sentences:
-            if sentence.sentence_id == sentence_id:
-                sentence.status = status
-                if approved_suggestion:
-                    sentence.approved_suggestion = approved_suggestion
-
-                # Update session status to in_progress once first action taken
-                if session.status == "pending_review":
-                    session.status = "in_progress"
-
-                return True
-
-        return False
+        return self._update_session(session_id, mutate)
 
     def update_sentence_suggestion(
         self,
@@ -118,17 +159,15 @@ class HITLSessionManager:
         Returns:
             True if update successful, False otherwise
         """
-        session = self.get_session(session_id)
-        if not session:
+        def mutate(session: BiasReviewSession) -> bool:
+            for sentence in session.sentences:
+                if sentence.sentence_id == sentence_id:
+                    sentence.suggestion = new_suggestion
+                    sentence.status = "pending"  # Reset to pending after regeneration
+                    return True
             return False
 
-        for sentence in session.sentences:
-            if sentence.sentence_id == sentence_id:
-                sentence.suggestion = new_suggestion
-                sentence.status = "pending"  # Reset to pending after regeneration
-                return True
-
-        return False
+        return self._update_session(session_id, mutate)
 
     def get_session_stats(self, session_id: str) -> Optional[Dict]:
         """
@@ -140,7 +179,7 @@ class HITLSessionManager:
         Returns:
             Dictionary with counts or None if session not found
         """
-        session = self.get_session(session_id)
+        session = self._load_session(session_id)
         if not session:
             return None
 
@@ -166,7 +205,7 @@ class HITLSessionManager:
         Returns:
             True if all sentences are approved, False otherwise
         """
-        session = self.get_session(session_id)
+        session = self._load_session(session_id)
         if not session:
             return False
 
@@ -187,12 +226,11 @@ class HITLSessionManager:
         Returns:
             True if successful, False otherwise
         """
-        session = self.get_session(session_id)
-        if not session:
-            return False
+        def mutate(session: BiasReviewSession) -> bool:
+            session.status = "completed"
+            return True
 
-        session.status = "completed"
-        return True
+        return self._update_session(session_id, mutate)
 
     def delete_session(self, session_id: str) -> bool:
         """
@@ -217,3 +255,150 @@ class HITLSessionManager:
             Dictionary of all sessions
         """
         return self._sessions
+
+    def count_sessions(self) -> int:
+        """
+        Get the number of active sessions.
+
+        Returns:
+            Number of sessions currently stored
+        """
+        return len(self._sessions)
+
+
+class RedisHITLSessionManager(HITLSessionManager):
+    """
+    HITL session manager backed by Redis.
+
+    Sessions are shared between worker processes and expire automatically.
+    Session metadata and sentences are stored as JSON, and the original PDF
+    is stored under a separate binary key so status updates do not rewrite it.
+    Updates are optimistic transactions (WATCH/MULTI) on the session key, so
+    concurrent updates from different workers are retried instead of lost.
+    A sorted set maps each session id to its expiry time, so active sessions
+    are counted with ZCOUNT instead of scanning the keyspace.
+    """
+
+    KEY_PREFIX = "hitl:session:"
+    INDEX_KEY = "hitl:sessions"
+
+    def __init__(self, redis_url: str, ttl_seconds: int = 24 * 60 * 60):
+        """
+        Initialize the Redis-backed session manager.
+
+        Args:
+            redis_url: Redis connection URL (e.g. redis://localhost:6379/0)
+            ttl_seconds: Lifetime of a session since its last update
+        """
+        if not REDIS_AVAILABLE:
+            raise ImportError("redis library not installed. Install with: pip install redis")
+
+        self._redis = redis.Redis.from_url(redis_url)
+        self._ttl = ttl_seconds
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.KEY_PREFIX}{session_id}"
+
+    def _pdf_key(self, session_id: str) -> str:
+        return f"{self.KEY_PREFIX}{session_id}:pdf"
+
+    def create_session(
+        self,
+        filename: str,
+        sentences: list,
+        raw_text: str,
+        original_pdf_bytes: Optional[bytes] = None
+    ) -> BiasReviewSession:
+        session = super().create_session(filename, sentences, raw_text, original_pdf_bytes)
+        pipe = self._redis.pipeline()
+        if original_pdf_bytes is not None:
+            pipe.set(self._pdf_key(session.session_id), original_pdf_bytes, ex=self._ttl)
+        # Drop index entries of sessions that have expired meanwhile
+        pipe.zremrangebyscore(self.INDEX_KEY, "-inf", time.time())
+        pipe.execute()
+        return session
+
+    def _write_session(self, pipe, session: BiasReviewSession) -> None:
+        # The PDF never changes after creation, so only refresh its expiry
+        pipe.set(
+            self._key(session.session_id),
+            session.model_dump_json(exclude={"original_pdf_bytes"}),
+            ex=self._ttl
+        )
+        pipe.expire(self._pdf_key(session.session_id), self._ttl)
+        pipe.zadd(self.INDEX_KEY, {session.session_id: time.time() + self._ttl})
+
+    def _save_session(self, session: BiasReviewSession) -> None:
+        pipe = self._redis.pipeline()
+        self._write_session(pipe, session)
+        pipe.execute()
+
+    def _update_session(
+        self,
+        session_id: str,
+        mutate: Callable[[BiasReviewSession], bool]
+    ) -> bool:
+        key = self._key(session_id)
+
+        def apply(pipe) -> bool:
+            # Reads run immediately while the key is watched; execute() raises
+            # WatchError (and transaction() retries) if another writer got in first
+            data = pipe.get(key)
+            if data is None:
+                return False
+            session = BiasReviewSession.model_validate_json(data)
+            if not mutate(session):
+                return False
+            pipe.multi()
+            self._write_session(pipe, session)
+            return True
+
+        return self._redis.transaction(apply, key, value_from_callable=True)
+
+    def get_session(self, session_id: str, include_pdf: bool = True) -> Optional[BiasReviewSession]:
+        if not include_pdf:
+            data = self._redis.get(self._key(session_id))
+            return BiasReviewSession.model_validate_json(data) if data is not None else None
+
+        data, pdf_bytes = self._redis.mget(self._key(session_id), self._pdf_key(session_id))
+        if data is None:
+            return None
+
+        session = BiasReviewSession.model_validate_json(data)
+        session.original_pdf_bytes = pdf_bytes
+        return session
+
+    def delete_session(self, session_id: str) -> bool:
+        pipe = self._redis.pipeline()
+        pipe.delete(self._key(session_id), self._pdf_key(session_id))
+        pipe.zrem(self.INDEX_KEY, session_id)
+        deleted, _ = pipe.execute()
+        return deleted > 0
+
+    def get_all_sessions(self) -> Dict[str, BiasReviewSession]:
+        sessions = {}
+        for session_id in self._redis.zrangebyscore(self.INDEX_KEY, time.time(), "+inf"):
+            session_id = session_id.decode()
+            session = self._load_session(session_id)
+            if session:
+                sessions[session_id] = session
+        return sessions
+
+    def count_sessions(self) -> int:
+        # Sessions whose expiry is still in the future (O(log N))
+        return self._redis.zcount(self.INDEX_KEY, time.time(), "+inf")
+
+
+def create_session_manager(redis_url: Optional[str] = None) -> HITLSessionManager:
+    """
+    Create the session manager for the configured backend.
+
+    Args:
+        redis_url: Redis connection URL; falls back to in-memory storage if empty
+
+    Returns:
+        RedisHITLSessionManager when redis_url is set, otherwise HITLSessionManager
+    """
+    if redis_url:
+        return RedisHITLSessionManager(redis_url)
+    return HITLSessionManager()
@@ -32,6 +32,22 @@ class PDFProcessor:
         self.llm_client = MistralClient(api_key=mistral_api_key)
         logger.info("PDFProcessor initialized")
 
+    def _extract_document_text(self, doc: "fitz.Document") -> str:
+        """
+        Join the text of every page of an open document and close it.
+
+        Page texts are collected in a list and joined once, rather than
+        growing one string per page, so large PDFs are not copied repeatedly.
+        """
+        page_texts = []
+        for page_num, page in enumerate(doc):
+            page_texts.append(page.get_text("text"))
+            page_texts.append("\n")
+            logger.debug(f"Extracted text from page {page_num + 1}")
+
+        doc.close()
+        return "".join(page_texts)
+
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         """
         Extract raw text from PDF using PyMuPDF (fitz).
@@ -49,14 +65,7 @@ class PDFProcessor:
         try:
             logger.info(f"Opening PDF: {pdf_path}")
             doc = fitz.open(pdf_path)
-            
-            full_text = ""
-            for page_num, page in enumerate(doc):
-                text = page.get_text("text")
-                full_text += text + "\n"
-                logger.debug(f"Extracted text from page {page_num + 1}")
-            
-            doc.close()
+            full_text = self._extract_document_text(doc)
             
             if not full_text.strip():
                 logger.warning("No text found in PDF. PDF might be image-based (requires OCR).")
@@ -313,14 +322,7 @@ Remember:
             
             # Open PDF from bytes
             doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-            
-            full_text = ""
-            for page_num, page in enumerate(doc):
-                text = page.get_text("text")
-                full_text += text + "\n"
-                logger.debug(f"Extracted text from page {page_num + 1}")
-            
-            doc.close()
+            full_text = self._extract_document_text(doc)
             
             if not full_text.strip():
                 return {
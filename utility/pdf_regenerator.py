@@ -23,11 +23,41 @@ This module can be safely deleted if PDF generation will never be needed.
 import logging
 import fitz  # PyMuPDF
 import re
+from bisect import bisect_right
+from functools import lru_cache
 from typing import List, Tuple, Optional, Dict
 from api.schemas import BiasReviewItem
 
 logger = logging.getLogger(__name__)
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1)
+def _detect_nepali_font() -> str:
+    """
+    Get the best available font for Nepali text.
+    Returns font name to use for text insertion.
+    Cached for the process, so a real font scan would run only once.
+    """
+    # Try to use a font that supports Devanagari script
+    # Common fonts that support Nepali/Devanagari:
+    # - NotoSansDevanagari
+    # - Mangal
+    # - Nirmala UI (Windows)
+    # - Lohit Devanagari (Linux)
+
+    # PyMuPDF built-in fonts that might work
+    fonts_to_try = [
+        "times-roman",  # Has better Unicode support than helv
+        "helv",
+        "cour"
+    ]
+
+    # For now, use times-roman as it has better Unicode support
+    # In production, you should embed a proper Devanagari font
+    return "times-roman"
+
 
 class PDFRegenerator:
     """
@@ -38,30 +68,7 @@ class PDFRegenerator:
     def __init__(self):
         """Initialize PDF regenerator."""
         # Try to register Nepali font support
-        self.nepali_font = self._get_nepali_font()
-
-    def _get_nepali_font(self) -> str:
-        """
-        Get the best available font for Nepali text.
-        Returns font name to use for text insertion.
-        """
-        # Try to use a font that supports Devanagari script
-        # Common fonts that support Nepali/Devanagari:
-        # - NotoSansDevanagari
-        # - Mangal
-        # - Nirmala UI (Windows)
-        # - Lohit Devanagari (Linux)
-
-        # PyMuPDF built-in fonts that might work
-        fonts_to_try = [
-            "times-roman",  # Has better Unicode support than helv
-            "helv",
-            "cour"
-        ]
-
-        # For now, use times-roman as it has better Unicode support
-        # In production, you should embed a proper Devanagari font
-        return "times-roman"
+        self.nepali_font = _detect_nepali_font()
 
     def regenerate_pdf(
         self,
@@ -83,29 +90,36 @@ class PDFRegenerator:
         try:
             logger.info(f"Starting PDF regeneration for {output_filename}")
 
-            # Open the original PDF from bytes
-            doc = fitz.open(stream=original_pdf_bytes, filetype="pdf")
+            # One edit per distinct sentence (repeats such as headers/footers
+            # are replaced everywhere by the first approved suggestion)
+            edits: Dict[str, str] = {}
+            for item in sentences:
+                if item.is_biased and item.approved_suggestion and item.status == "approved":
+                    edits.setdefault(item.original_sentence, item.approved_suggestion)
 
-            # Count replacements and track sentence details
-            replacements_made = 0
-            sentence_details = []
+            if edits:
+                # Open the original PDF from bytes
+                doc = fitz.open(stream=original_pdf_bytes, filetype="pdf")
 
-            # Process each sentence that has an approved suggestion
-            for item in sentences:
-                was_modified = False
-                final_sentence = item.original_sentence
+                # Replace all approved sentences in one pass over the pages
+                counts = self._replace_text_in_pdf(doc, list(edits.items()))
 
-                if item.is_biased and item.approved_suggestion and item.status == "approved":
-                    # Replace the biased sentence with approved suggestion
-                    count = self._replace_text_in_pdf(
-                        doc,
-                        item.original_sentence,
-                        item.approved_suggestion
-                    )
-                    replacements_made += count
-                    if count > 0:
-                        was_modified = True
-                        final_sentence = item.approved_suggestion
+                # Convert the modified document to bytes
+                output_bytes = doc.tobytes()
+                doc.close()
+            else:
+                # Nothing approved: the original PDF is the result, no parse/rewrite needed
+                counts = []
+                output_bytes = original_pdf_bytes
+
+            replacement_counts = dict(zip(edits, counts))
+            replacements_made = sum(counts)
+
+            # Track sentence details
+            sentence_details = []
+            for item in sentences:
+                was_modified = replacement_counts.get(item.original_sentence, 0) > 0
+                final_sentence = edits[item.original_sentence] if was_modified else item.original_sentence
 
                 # Add sentence details
                 sentence_details.append({
@@ -119,10 +133,6 @@ class PDFRegenerator:
 
             logger.info(f"Made {replacements_made} text replacements in PDF")
 
-            # Convert the modified document to bytes
-            output_bytes = doc.tobytes()
-            doc.close()
-
             return (True, output_bytes, None, sentence_details)
 
         except Exception as e:
@@ -133,63 +143,112 @@ class PDFRegenerator:
     def _replace_text_in_pdf(
         self,
         doc: fitz.Document,
-        old_text: str,
-        new_text: str
-    ) -> int:
+        edits: List[Tuple[str, str]]
+    ) -> List[int]:
         """
         Replace text in PDF document using PyMuPDF's redaction feature.
 
+        All edits are handled in one pass over the pages: each page's words
+        are extracted once and scanned for every sentence with a single
+        compiled matcher, every match is marked for redaction, the redactions
+        are applied once (one content-stream rewrite per page), then all
+        replacement text is drawn on one Shape and committed once.
+
         Args:
             doc: PyMuPDF Document object
-            old_text: Text to find and replace
-            new_text: Replacement text
+            edits: (old_text, new_text) pairs
 
         Returns:
-            Number of replacements made
+            Number of replacements made for each edit
         """
-        replacements = 0
+        counts = [0] * len(edits)
+
+        # One matcher for all sentences; whitespace is normalised to single
+        # spaces on both sides. A repeated sentence maps to its first edit.
+        needles: Dict[str, int] = {}
+        for index, (old_text, _) in enumerate(edits):
+            needle = _WHITESPACE_RE.sub(" ", old_text).strip()
+            if needle:
+                needles.setdefault(needle, index)
+        if not needles:
+            return counts
+        matcher = re.compile("|".join(map(re.escape, sorted(needles, key=len, reverse=True))))
 
         try:
-            # Search for the text across all pages
             for page_num in range(len(doc)):
                 page = doc[page_num]
 
-                # Search for the old text
-                text_instances = page.search_for(old_text)
-
-                if text_instances:
-                    logger.debug(f"Found {len(text_instances)} instances on page {page_num + 1}")
-
-                    for inst in text_instances:
-                        # Get the rectangle coordinates
-                        rect = inst
-
-                        # Add redaction annotation to remove old text
-                        page.add_redact_annot(rect, fill=(1, 1, 1))  # White fill
-
-                        # Apply redactions
-                        page.apply_redactions()
-
-                        # Insert new text at the same location
-                        # Get font size from the area (approximate)
-                        fontsize = rect.height * 0.8  # Approximate font size
-
-                        # Insert the new text
-                        page.insert_textbox(
-                            rect,
-                            new_text,
-                            fontsize=fontsize,
-                            fontname="helv",  # Use Helvetica as default
-                            align=fitz.TEXT_ALIGN_LEFT
-                        )
+                # Locate every edit on this page before changing anything
+                placements = []  # (rect, new_text, edit index)
+                words = page.get_text("words")
+                if not words:
+                    continue
+
+                # Page text as words joined by single spaces, with each word's offset
+                word_starts = []
+                offset = 0
+                for word in words:
+                    word_starts.append(offset)
+                    offset += len(word[4]) + 1
+                page_text = " ".join(word[4] for word in words)
+
+                for match in matcher.finditer(page_text):
+                    first = bisect_right(word_starts, match.start()) - 1
+                    last = bisect_right(word_starts, match.end() - 1) - 1
+                    index = needles[match.group(0)]
+                    for rect in self._line_rects(words[first:last + 1]):
+                        placements.append((rect, edits[index][1], index))
+
+                if not placements:
+                    continue
+
+                logger.debug(f"Found {len(placements)} instances on page {page_num + 1}")
+
+                # Add redaction annotations to remove old text, then apply them once
+                for rect, _, _ in placements:
+                    page.add_redact_annot(rect, fill=(1, 1, 1))  # White fill
+                page.apply_redactions()
+
+                # Insert new text at the same locations, drawn on one Shape so
+                # the page's content stream is written once for all of them
+                shape = page.new_shape()
+                for rect, new_text, index in placements:
+                    # Get font size from the area (approximate)
+                    fontsize = rect.height * 0.8  # Approximate font size
+
+                    shape.insert_textbox(
+                        rect,
+                        new_text,
+                        fontsize=fontsize,
+                        fontname="helv",  # Use Helvetica as default
+                        align=fitz.TEXT_ALIGN_LEFT
+                    )
+                    counts[index] += 1
+                shape.commit()
 
-                        replacements += 1
-                        logger.debug(f"Replaced text on page {page_num + 1}")
+                logger.debug(f"Replaced {len(placements)} texts on page {page_num + 1}")
 
         except Exception as e:
             logger.warning(f"Error during text replacement: {e}")
 
-        return replacements
+        return counts
+
+    @staticmethod
+    def _line_rects(words: List[tuple]) -> List[fitz.Rect]:
+        """
+        Bounding rectangle per text line for a run of words from
+        page.get_text("words") (one rect per line, like page.search_for).
+        """
+        rects = []
+        current_line = None
+        for x0, y0, x1, y1, _, block_no, line_no, _ in words:
+            word_rect = fitz.Rect(x0, y0, x1, y1)
+            if (block_no, line_no) == current_line:
+                rects[-1] |= word_rect
+            else:
+                rects.append(word_rect)
+                current_line = (block_no, line_no)
+        return rects
 
     def create_simple_pdf_from_sentences(
         self,